@@ -1,5 +1,4 @@
 import configparser
-import shutil
 from pathlib import Path
 from Menu import Menu
 
@@ -83,14 +82,14 @@ class Config:
     def print_settings(self) -> None:
         """WARNING: DEPRECATED BY NEW VERSION OF settings_menu\n
         Print the current config to the console."""
-        print('-' * (shutil.get_terminal_size().columns - 1))  # Horizontal line (cosmetic)
+        print(Menu.horizontal_line())  # Horizontal line (cosmetic)
         print("\nCurrent Settings:\n")
         for section in self.config.sections():
             print(f"[{section}]")
             for key, value in self.config.items(section):
                 print(f"{key} = {value}")
             print()
-        print('-' * (shutil.get_terminal_size().columns - 1))
+        print(Menu.horizontal_line())
 
     @staticmethod
     def is_valid_option_value(option: str, value: str) -> bool:
@@ -125,7 +124,7 @@ class Config:
         """WARNING: DEPRECATED BY NEW VERSION OF settings_menu\n
         Prompt the user to update a single config option. Update the option and save.
         """
-        print('-' * (shutil.get_terminal_size().columns - 1))  # Horizontal line (cosmetic)
+        print(Menu.horizontal_line())  # Horizontal line (cosmetic)
         section, option, value = "", "", ""
 
         while section not in self.config.sections():
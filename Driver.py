@@ -1,15 +1,16 @@
 import PackageInstaller
-PackageInstaller.check_and_install_dependencies()  # Install package dependencies
+if __name__ == "__main__":  # Not when imported (e.g. by parallel worker processes)
+    PackageInstaller.check_and_install_dependencies()  # Install package dependencies
 
-import multiprocessing
-from collections import defaultdict
 from MaintenanceDatabase import MaintenanceDatabase
+from ScraperPool import ScraperPool
 from Scraper import *
 from Log import *
 from Config import *
 from User import login_prompt
 from SetupUtils import SetupUtils
 from pathlib import Path
+import traceback
 from Menu import Menu
 
 
@@ -26,11 +27,19 @@ class Driver:
 
         self.password_input_hidden = self.config.get("Options", "b_password_inputs_hidden")
 
+        # Chrome and chromedriver directories (from the config, a restart is required for changes to take effect)
+        chrome_version = self.config.get('Scraper', 's_chrome_version')
+        chrome_platform = self.config.get('Scraper', 's_chrome_platform')
+        self.chrome_dir = Path.cwd() / 'Browser' / chrome_version / ('chrome-' + chrome_platform)
+        self.chromedriver_dir = Path.cwd() / 'Browser' / chrome_version / ('chromedriver-' + chrome_platform)
+
         print("\nCALNET LOGIN\n")
         self.user = login_prompt(hidden=self.password_input_hidden)  # Log into the user's Calnet profile
         Menu.clear_lines(3)
 
         self.database = self.connect_primary_database()
+        self.scraper_pool = None  # Pool of parallel scrapers (launched on the first parallel scrape)
+        self.scraper_pool_settings = None  # Configuration the running pool of parallel scrapers was launched with
 
     def connect_primary_database(self) -> MaintenanceDatabase:
         """Connect to the database (database connection information and credentials are stored in the config).\n
@@ -46,10 +55,14 @@ class Driver:
             password = Menu.input_prompt(prompt="Database Password: ", hidden=self.password_input_hidden)
 
         headless = self.config.get("Scraper", "b_primary_scraper_headless")  # For primary scraper only
+        http_threads = self.config.get("Scraper", "i_http_scraper_threads")
+        memo_size = self.config.get("Scraper", "i_scrape_memo_size")
+        memo_ttl = self.config.get("Scraper", "i_scrape_memo_ttl_seconds")
         database = MaintenanceDatabase(log=self.log, chrome_path=self.get_chrome_dir(),
                                        chromedriver_path=self.get_chromedriver_dir(), calnet_user=self.user,
                                        host=host, dbname=dbname, user=user, password=password, port=port,
-                                       headless=headless)
+                                       headless=headless, http_threads=http_threads, cache_ttl=self.get_cache_ttl(),
+                                       memo_size=memo_size, memo_ttl=memo_ttl)
         return database
 
     def main_menu(self) -> None:
@@ -71,6 +84,7 @@ class Driver:
                 case 2:
                     self.config.settings_menu()
                 case 3:
+                    self.close_scraper_pool()  # Shut down parallel scrapers
                     return None
 
     def scrape_range_prompt(self, item_type: str, prefix: str = "") -> None:
@@ -114,40 +128,6 @@ class Driver:
         print()  # Cosmetic padding
         print(f"Finished scraping requests from ids [{prefix}{start}] to [{prefix}{stop}]")
 
-    @staticmethod
-    def add_item_range_parallel_helper(item_type: str, item_ids: list, log: Log, chrome_path: Path,
-                                       chromedriver_path: Path, calnet_user: User, process_id: int, headless: bool,
-                                       db_args: tuple) -> None:
-        """Initialize and run a single process for scraping work order requests and adding them to a database.
-
-        A new database object is created for every process to establish a unique connection and scraper as psycopg2
-        connections and selenium webdrivers cannot be shared between processes.
-
-        Args:
-            item_type: Type of item to be scraped (either 'request' or 'order')
-            item_ids: List of work order item ids to be scraped/added by this process
-            log: Log object for recording progress and error messages
-            chrome_path: Path pointing to the chrome directory to be used for Scrapers
-            chromedriver_path: Path pointing to the chromedriver directory to be used for Scrapers
-            calnet_user: Calnet user used to log into maintenance.housing.berkeley.edu
-            process_id: Unique integer id assigned to this specific process
-            headless: True if this process should be run in a headless or headful browser
-            db_args: Tuple of arguments to connect to the database
-        """
-        host, dbname, user, password, port = db_args
-        database = MaintenanceDatabase(log=log, chrome_path=chrome_path, chromedriver_path=chromedriver_path,
-                                       calnet_user=calnet_user, process_id=process_id, headless=headless, host=host,
-                                       dbname=dbname, user=user, password=password, port=port)
-
-        try:
-            if item_type == 'request':
-                database.add_requests(item_ids)
-            elif item_type == 'order':
-                database.add_orders(item_ids)
-            database.close()
-        except KeyboardInterrupt:  # Allows user to exit program to interrupt scraping a large range of items
-            database.close()
-
     def add_item_range_parallel(self, item_type: str, start: int, stop: int, num_processes: int, headless: bool = False,
                                 prefix: str = "") -> None:
         """Scrape and add a range of work order requests or work orders to the database (in parallel).
@@ -160,54 +140,95 @@ class Driver:
             headless: True to run processes in a headless browsers
             prefix: Prefix to append to work order numbers (leave empty for requests)
         """
-        log = self.log
-        chrome_path = self.get_chrome_dir()
-        chromedriver_path = self.get_chromedriver_dir()
-        calnet_user = self.user
-        db_args = self.database.db_args
+        try:
+            scraper_pool = self.get_scraper_pool(num_processes, headless)
+            scraper_pool.add_item_range(item_type, start, stop, prefix)
+        except Exception:  # A parallel scraper failed (to start or during a batch), discard the pool
+            self.log.add("parallel scrapers failed ... stopping this scrape (see log for details)")
+            self.log.add_quiet(f"{traceback.format_exc()}\n")
+            self.close_scraper_pool()
+        except KeyboardInterrupt:  # Queued batches were cancelled, discard the pool once workers stop
+            self.close_scraper_pool()
+            raise
+
+    def get_scraper_pool(self, num_processes: int, headless: bool) -> ScraperPool:
+        """Get the pool of parallel scrapers, launching a new pool only if none is running or the running pool was
+        launched with a different configuration (a new pool picks up config changes and the current login cookies).
+        Parallel scrapers are kept alive between scrapes.
 
-        # Uniformly assign item ids to different processes
-        # An item id is assigned to a process with: <process id> = <item id> (mod <number of processes>)
-        id_dict = defaultdict(list)
-        for item_id in range(start, stop):
-            process_num = item_id % num_processes
-            if item_type == 'request':
-                id_dict[process_num].append(item_id)
-            elif item_type == 'order':
-                id_dict[process_num].append(prefix + str(item_id))
-
-        # Generate a list of argument tuples
-        # Each tuple will be passed to add_item_range_parallel to create a new process
-        args = []
-        for process_id in range(num_processes):
-            item_ids = id_dict[process_id]
-            args.append((item_type, item_ids, log, chrome_path, chromedriver_path, calnet_user,
-                         process_id + 1, headless, db_args))  # Process 0 is reserved for the primary (driver) database
+        Args:
+            num_processes: number of parallel processes to use
+            headless: True to run processes in a headless browsers
+
+        Returns:
+            The running ScraperPool
+
+        Raises:
+            BrokenProcessPool: If a parallel scraper fails to start
+        """
+        recycle_after = self.config.get("Scraper", "i_browser_pool_recycle_after")
+        http_threads = self.config.get("Scraper", "i_http_scraper_threads")
+        memo_size = self.config.get("Scraper", "i_scrape_memo_size")
+        memo_ttl = self.config.get("Scraper", "i_scrape_memo_ttl_seconds")
+        batch_size = self.config.get("Scraper", "i_parallel_batch_size")
+        cache_ttl = self.get_cache_ttl()
+        settings = (num_processes, headless, recycle_after, http_threads, cache_ttl, memo_size, memo_ttl, batch_size)
+        if self.scraper_pool is not None:
+            if self.scraper_pool_settings == settings:
+                return self.scraper_pool
+            self.close_scraper_pool()
 
         # Main scraper needs to be closed to allow for its Chrome profile to be cloned for each parallel process
-        self.database.close()
-        del self.database
-        with multiprocessing.Pool(processes=num_processes) as pool:
-            pool.starmap(Driver.add_item_range_parallel_helper, args)
-        self.database = self.connect_primary_database()  # Restart primary (driver) database
+        # (only if a parallel process does not have a Chrome profile yet, existing clones are reused)
+        clone_needed = not all(Scraper.get_profile_instance_path(self.user, process_id).exists()
+                               for process_id in range(1, num_processes + 1))
+        db_args = self.database.db_args
+        # Workers reuse the primary scraper's Calnet login, but each worker logs into its own maintenance site session
+        cookies = self.database.scraper.get_calnet_cookies()
+        if clone_needed:
+            self.database.close()
+            del self.database
+        try:
+            self.scraper_pool = ScraperPool(log=self.log, chrome_path=self.get_chrome_dir(),
+                                            chromedriver_path=self.get_chromedriver_dir(), calnet_user=self.user,
+                                            db_args=db_args, num_processes=num_processes, headless=headless,
+                                            recycle_after=recycle_after, http_threads=http_threads,
+                                            cache_ttl=cache_ttl, memo_size=memo_size, memo_ttl=memo_ttl,
+                                            batch_size=batch_size, cookies=cookies)
+            self.scraper_pool_settings = settings
+        finally:
+            if clone_needed:
+                self.database = self.connect_primary_database()  # Restart primary (driver) database
+        return self.scraper_pool
+
+    def close_scraper_pool(self) -> None:
+        """Shut down the pool of parallel scrapers (if one is running)."""
+        if self.scraper_pool is not None:
+            self.scraper_pool.close()
+            self.scraper_pool = None
+
+    def get_cache_ttl(self) -> int | None:
+        """Get the time (in seconds) that scraped pages are kept in the on-disk page cache.
+
+            Returns: Cache time-to-live in seconds (None if the page cache is disabled)
+        """
+        if not self.config.get('Scraper', 'b_cache_enabled'):
+            return None
+        return self.config.get('Scraper', 'i_cache_ttl_seconds')
 
     def get_chrome_dir(self) -> Path:
         """Get the path to the directory of the currently-enabled Chrome version (e.g. path to chrome-win64).
 
             Returns: Path object pointing to the Chrome directory
         """
-        chrome_version = self.config.get('Scraper', 's_chrome_version')
-        chrome_platform = self.config.get('Scraper', 's_chrome_platform')
-        return Path.cwd() / 'Browser' / chrome_version / ('chrome-' + chrome_platform)
+        return self.chrome_dir
 
     def get_chromedriver_dir(self) -> Path:
         """Get the path to the directory of the currently-enabled chromedriver version (e.g. chromedriver-win64).
 
             Returns: Path object pointing to the chromedriver directory.
         """
-        chrome_version = self.config.get('Scraper', 's_chrome_version')
-        chrome_platform = self.config.get('Scraper', 's_chrome_platform')
-        return Path.cwd() / 'Browser' / chrome_version / ('chromedriver-' + chrome_platform)
+        return self.chromedriver_dir
 
     def run(self):
         """Run this driver. Load and display the main menu."""
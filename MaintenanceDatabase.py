@@ -1,4 +1,5 @@
 import psycopg2
+from psycopg2.extras import execute_values
 from Scraper import *
 from Log import *
 import traceback
@@ -8,8 +9,12 @@ from pathlib import Path
 
 
 class MaintenanceDatabase:
+    _insert_batch_size = 100  # Number of scraped items to insert into the database at a time
+
     def __init__(self, log: Log, chrome_path: Path, chromedriver_path: Path, calnet_user: User, host: str, dbname: str,
-                 user: str, password: str, port: int, process_id: int = 0, headless=True):
+                 user: str, password: str, port: int, process_id: int = 0, headless=True, http_threads: int = 0,
+                 cache_ttl: int | None = None, memo_size: int = 0, memo_ttl: float = 0,
+                 cookies: list[dict] | None = None):
         """A connection to a PostgreSQL database with utilities to add work order and work order request data.
 
         Args:
@@ -24,9 +29,15 @@ class MaintenanceDatabase:
             port: Port for the database
             process_id: Unique process id for this database connection (for parallel processing)
             headless: True to run the scraper's webdriver in headless mode
+            http_threads: Number of concurrent HTTP requests for the scraper to use (0 to only use the webdriver)
+            cache_ttl: Time (in seconds) for the scraper to keep pages in the on-disk page cache (None to disable)
+            memo_size: Number of recently scraped items for the scraper to remember (0 to disable)
+            memo_ttl: Time (in seconds) for the scraper to remember a scraped item (0 to never expire)
+            cookies: Browser cookies to start the scraper's webdriver with (e.g. another scraper's login cookies)
         """
         self.scraper = Scraper(chrome_path=chrome_path, chromedriver_path=chromedriver_path, user=calnet_user,
-                               process_id=process_id, headless=headless)
+                               process_id=process_id, headless=headless, http_threads=http_threads,
+                               cache_ttl=cache_ttl, memo_size=memo_size, memo_ttl=memo_ttl, cookies=cookies)
         self.log = log
         self.db_name = dbname
         self.db_args = (host, dbname, user, password, port)
@@ -40,13 +51,20 @@ class MaintenanceDatabase:
                                    "date_last_posted", "trade", "contractor_name", "est_completion_date",
                                    "task_description", "requested_action", "corrective_action"]
 
-        self.connection = psycopg2.connect(host=host, dbname=dbname, user=user, password=password, port=port)
-        self.cursor = self.connection.cursor()
+        self.connection = None
+        try:
+            self.connection = psycopg2.connect(host=host, dbname=dbname, user=user, password=password, port=port)
+            self.cursor = self.connection.cursor()
 
-        self.initialize_requests_table()
-        self.initialize_orders_table()
+            self.initialize_requests_table()
+            self.initialize_orders_table()
 
-        self.connection.commit()
+            self.connection.commit()
+        except BaseException:  # Close the scraper (and its browser) if the database cannot be set up
+            if self.connection is not None:
+                self.connection.close()
+            self.scraper.close()
+            raise
 
     def initialize_requests_table(self) -> None:
         """Create database table for work requests if none exists yet."""
@@ -95,36 +113,96 @@ class MaintenanceDatabase:
             )
             """)
 
-    def add_request(self, request_id: int) -> None:
-        """Scrape and insert a work request into the database.
+    def request_exists(self, request_id: int) -> bool:
+        """Check if a work request with the given id already exists in the database.
 
         Args:
             request_id: id of the work request
+
+        Returns:
+            True if an entry with the same id already exists (or the check fails), False otherwise
         """
         try:
-            # Skip this request if an entry with the same id already exists
             select_query = f"SELECT 1 FROM request WHERE id = {request_id}"
             self.cursor.execute(select_query)
             if self.cursor.fetchone():
                 self.log.add(f"entry with id [{request_id}] already exists ... skipping this insert request")
-                return None
-
-            # Scrape request
-            request = self.scraper.scrape_request(request_id)
+                return True
+            return False
+        except Exception as e:
+            self.connection.rollback()
+            self.log.add(f"failed to check for request [{request_id}] ... skipping this insert request")
+            self.log.add_quiet(f"{traceback.format_exc()}\n")
+            return True
 
-            # Filter out all null values and their corresponding columns
-            columns = [c for c in self.all_columns_requests if getattr(request, c)]  # Remove missing attributes from request
-            values = [str(getattr(request, c)).replace("'", "") for c in columns]  # "'" causes SQL query errors
-            columns = ', '.join(columns)
-            values = ', '.join([f"'{v}'" for v in values])
-            insert_query = f"INSERT INTO request ({columns}) VALUES ({values});"
+    def insert_rows(self, table: str, columns: list[str], rows: list[tuple], names: list[str]) -> None:
+        """Insert rows into a database table in a single batch. If the batch fails, rows are inserted one at a time so
+        that only the failing rows are skipped.
 
-            self.cursor.execute(insert_query)
+        Args:
+            table: Name of the table to insert into (quoted if necessary)
+            columns: Names of the columns of each row
+            rows: Rows (tuples of column values) to insert
+            names: Name of each row for logging (e.g. "request [379422]")
+        """
+        try:
+            insert_query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+            execute_values(self.cursor, insert_query, rows, page_size=len(rows))
             self.connection.commit()
-            self.log.add(f"successfully inserted request [{request_id}] to database [{self.db_name}]")
+            for name in names:
+                self.log.add(f"successfully inserted {name} to database [{self.db_name}]")
         except Exception as e:
-            self.log.add(f"failed to insert request [{request_id}]")
-            self.log.add_quiet(f"{traceback.format_exc()}\n")
+            self.connection.rollback()
+            if len(rows) > 1:
+                for row, name in zip(rows, names):
+                    self.insert_rows(table, columns, [row], [name])
+            else:
+                self.log.add(f"failed to insert {names[0]}")
+                self.log.add_quiet(f"{traceback.format_exc()}\n")
+
+    def log_scrape_failure(self, name: str) -> None:
+        """Log that an item failed to scrape (called from within the except block, so the traceback is logged too).
+
+        Args:
+            name: Name of the item for logging (e.g. "request [379422]")
+        """
+        self.log.add(f"failed to scrape {name} ... skipping this insert request")
+        self.log.add_quiet(f"{traceback.format_exc()}\n")
+
+    def log_request_failure(self, request_id: int) -> None:
+        """Log that a work request failed to scrape (see MaintenanceDatabase.log_scrape_failure()).
+
+        Args:
+            request_id: id of the work request
+        """
+        self.log_scrape_failure(f"request [{request_id}]")
+
+    def log_order_failure(self, order_number: str) -> None:
+        """Log that a work order failed to scrape (see MaintenanceDatabase.log_scrape_failure()).
+
+        Args:
+            order_number: Order number of the work order
+        """
+        self.log_scrape_failure(f"order [{order_number}]")
+
+    def insert_requests(self, requests: list[WorkOrderRequest]) -> None:
+        """Insert scraped work requests into the database (in a single batch).
+
+        Args:
+            requests: The scraped work requests
+        """
+        # Missing (empty) attributes are inserted as null values
+        rows = [tuple(getattr(request, c) or None for c in self.all_columns_requests) for request in requests]
+        names = [f"request [{request.id}]" for request in requests]
+        self.insert_rows("request", self.all_columns_requests, rows, names)
+
+    def add_request(self, request_id: int) -> None:
+        """Scrape and insert a work request into the database.
+
+        Args:
+            request_id: id of the work request
+        """
+        self.add_requests([request_id])
 
     def add_requests(self, request_ids: Iterable[int]) -> None:
         """Scrape and insert work requests to database (for an iterable of request ids).
@@ -132,8 +210,22 @@ class MaintenanceDatabase:
         Args:
             request_ids: Iterable of request ids to scrape and insert
         """
-        for request_id in request_ids:
-            self.add_request(request_id)
+        # Skip requests if an entry with the same id already exists
+        request_ids = [request_id for request_id in request_ids if not self.request_exists(request_id)]
+
+        # Insert scraped requests in batches (remaining requests are still inserted if scraping is interrupted)
+        batch = []
+        try:
+            for request in self.scraper.scrape_requests(request_ids, on_error=self.log_request_failure):
+                if request is None:  # Failed to scrape (skipped)
+                    continue
+                batch.append(request)
+                if len(batch) >= MaintenanceDatabase._insert_batch_size:
+                    self.insert_requests(batch)
+                    batch = []
+        finally:
+            if batch:
+                self.insert_requests(batch)
 
     def add_request_range(self, start: int, stop: int) -> None:
         """Scrape and insert a range of work requests into the database.
@@ -142,40 +234,49 @@ class MaintenanceDatabase:
             start: First request id to scrape and insert (inclusive).
             stop: Last request id to scrape and insert (exclusive).
         """
-        for request_id in range(start, stop):
-            self.add_request(request_id)
+        self.add_requests(range(start, stop))
 
-    def add_order(self, order_number: str) -> None:
-        """Scrape and insert a work order into the database.
+    def order_exists(self, order_number: str) -> bool:
+        """Check if a work order with the given order number already exists in the database.
 
         Args:
-            order_number: The order number of the order.
+            order_number: The order number of the order
+
+        Returns:
+            True if an entry with the same order number already exists (or the check fails), False otherwise
         """
         try:
-            # Skip this request if an entry with the same id already exists
             select_query = f"SELECT 1 FROM \"order\" WHERE order_number = '{order_number}'"
             self.cursor.execute(select_query)
             if self.cursor.fetchone():
                 self.log.add(f"entry with order number [{order_number}] already exists ... skipping this insert "
                              f"request")
-                return None
+                return True
+            return False
+        except Exception as e:
+            self.connection.rollback()
+            self.log.add(f"failed to check for order [{order_number}] ... skipping this insert request")
+            self.log.add_quiet(f"{traceback.format_exc()}\n")
+            return True
 
-            # Scrape order
-            order = self.scraper.scrape_order(order_number)
+    def insert_orders(self, orders: list[WorkOrder]) -> None:
+        """Insert scraped work orders into the database (in a single batch).
 
-            # Filter out all null values and their corresponding columns
-            columns = [c for c in self.all_columns_orders if getattr(order, c)]  # Remove missing attributes from request
-            values = [str(getattr(order, c)).replace("'", "") for c in columns]  # "'" causes SQL query errors
-            columns = ', '.join(columns)
-            values = ', '.join([f"'{v}'" for v in values])
-            insert_query = f"INSERT INTO \"order\" ({columns}) VALUES ({values});"
+        Args:
+            orders: The scraped work orders
+        """
+        # Missing (empty) attributes are inserted as null values
+        rows = [tuple(getattr(order, c) or None for c in self.all_columns_orders) for order in orders]
+        names = [f"order [{order.order_number}]" for order in orders]
+        self.insert_rows('"order"', self.all_columns_orders, rows, names)
 
-            self.cursor.execute(insert_query)
-            self.connection.commit()
-            self.log.add(f"successfully inserted order [{order_number}] to database [{self.db_name}]")
-        except Exception as e:
-            self.log.add(f"failed to insert order [{order_number}]")
-            self.log.add_quiet(f"{traceback.format_exc()}\n")
+    def add_order(self, order_number: str) -> None:
+        """Scrape and insert a work order into the database.
+
+        Args:
+            order_number: The order number of the order.
+        """
+        self.add_orders([order_number])
 
     def add_orders(self, order_numbers: Iterable[str]) -> None:
         """Scrape and insert work orders for an iterable of order numbers.
@@ -183,8 +284,22 @@ class MaintenanceDatabase:
         Args:
             order_numbers: Iterable of order numbers (WITH PREFIXES).
         """
-        for order_number in order_numbers:
-            self.add_order(order_number)
+        # Skip orders if an entry with the same order number already exists
+        order_numbers = [order_number for order_number in order_numbers if not self.order_exists(order_number)]
+
+        # Insert scraped orders in batches (remaining orders are still inserted if scraping is interrupted)
+        batch = []
+        try:
+            for order in self.scraper.scrape_orders(order_numbers, on_error=self.log_order_failure):
+                if order is None:  # Failed to scrape (skipped)
+                    continue
+                batch.append(order)
+                if len(batch) >= MaintenanceDatabase._insert_batch_size:
+                    self.insert_orders(batch)
+                    batch = []
+        finally:
+            if batch:
+                self.insert_orders(batch)
 
     def add_order_range(self, start: int, stop: int, prefix: str = 'HM-') -> None:
         """Scrape and insert a range of work orders into the database.
@@ -194,8 +309,7 @@ class MaintenanceDatabase:
             stop: Last order number to scrape and insert (exclusive).
             prefix: String to append the beginning of each integer work order number.
         """
-        for int_order_number in range(start, stop):
-            self.add_order(prefix + str(int_order_number))
+        self.add_orders(prefix + str(int_order_number) for int_order_number in range(start, stop))
 
     def close(self) -> None:
         """Close the connection to the database."""
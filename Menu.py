@@ -1,7 +1,7 @@
+import functools
+import shutil
 import sys
-import keyboard
 import readchar
-from pwinput import pwinput
 
 
 class Menu:
@@ -12,11 +12,19 @@ class Menu:
         Args:
             num_lines: Number of lines to clear
         """
-        for _ in range(num_lines):
-            sys.stdout.write('\033[F')  # Cursor up one line
-            sys.stdout.write('\033[K')  # Clear the line
+        sys.stdout.write('\033[F\033[K' * num_lines)  # Cursor up one line and clear the line (for each line)
         sys.stdout.flush()
 
+    @staticmethod
+    @functools.cache
+    def horizontal_line() -> str:
+        """Get a horizontal line spanning the width of the console/terminal (the width is only measured once).
+
+        Returns:
+            The horizontal line string
+        """
+        return '-' * (shutil.get_terminal_size().columns - 1)
+
     @staticmethod
     def print_menu(options: list[str], selected_index: int, previous_lines: int = 0, title: str = None) -> int:
         """Prints a menu to the screen with a cursor '>' next to the currently-selected option.
@@ -70,22 +78,28 @@ class Menu:
         """
         selected_index = 0
         previous_lines = 0
+        dirty = True  # True if the menu needs to be (re-)rendered
 
         # Menu loop
         while True:
-            previous_lines = Menu.print_menu(options, selected_index, previous_lines, title)  # Render menu
+            if dirty:
+                previous_lines = Menu.print_menu(options, selected_index, previous_lines, title)  # Render menu
+            dirty = False
 
             # Debug mode uses the keyboard library instead of the readchar library to handle keyboard input.
             # The keyboard implementation works in the pycharm debugger console (readchar does not).
             if debug:
+                import keyboard  # Imported only when needed (slow to import, hooks global keyboard input)
                 key_event = keyboard.read_event()  # Read keyboard input
                 key_name = key_event.name
 
                 if key_event.event_type == keyboard.KEY_DOWN:
                     if key_name == 'up' and selected_index > 0:
                         selected_index -= 1  # Move cursor UP.
+                        dirty = True
                     elif key_name == 'down' and selected_index < len(options) - 1:
                         selected_index += 1  # Move cursor DOWN.
+                        dirty = True
                     elif key_name == 'enter' or key_name == '\n':
                         if clear:
                             Menu.clear_lines(previous_lines)  # Clear menu from screen.
@@ -96,8 +110,10 @@ class Menu:
 
                 if key_in == readchar.key.UP and selected_index > 0:
                     selected_index -= 1  # Move cursor UP.
+                    dirty = True
                 elif key_in == readchar.key.DOWN and selected_index < len(options) - 1:
                     selected_index += 1  # Move cursor DOWN.
+                    dirty = True
                 elif key_in == readchar.key.ENTER or key_in == '\n':
                     if clear:
                         Menu.clear_lines(previous_lines)  # Clear menu from screen.
@@ -115,6 +131,7 @@ class Menu:
             The string input entered by the user
         """
         if hidden:
+            from pwinput import pwinput
             user_in = pwinput(prompt=prompt)
         else:
             user_in = input(prompt)
@@ -1,14 +1,27 @@
+import hashlib
 import subprocess
 import sys
+from pathlib import Path
 
 
-def check_and_install_dependencies(path='requirements.txt') -> None:
+def check_and_install_dependencies(path='requirements.txt', marker_path='.deps_ok') -> None:
     """ Automatically install all required packages from the specified requirements file if they are not already
     installed.
 
+    Once all packages are installed, a hash of the requirements file is written to a marker file. Later calls return
+    immediately while the requirements file is unchanged.
+
     Args:
         path: path to requirements.txt file (optional)
+        marker_path: path to the marker file recording the last satisfied requirements (optional)
     """
+    requirements_hash = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    try:
+        if Path(marker_path).read_text() == requirements_hash:
+            return None  # Requirements already satisfied
+    except FileNotFoundError:
+        pass
+
     try:
         import multiprocessing
         from collections import defaultdict
@@ -18,17 +31,22 @@ def check_and_install_dependencies(path='requirements.txt') -> None:
         from Config import Config
         from User import User
         from SetupUtils import SetupUtils
-        from pathlib import Path
         from Menu import Menu
     except ImportError:
-        install_dependencies(path)
+        if not install_dependencies(path):
+            return None  # Check again next time
 
+    Path(marker_path).write_text(requirements_hash)
 
-def install_dependencies(path='requirements.txt') -> None:
+
+def install_dependencies(path='requirements.txt') -> bool:
     """ Automatically install all required packages from the specified requirements file.
 
     Args:
         path: path to requirements.txt file (optional)
+
+    Returns:
+        True if all packages were installed successfully, False otherwise
     """
     print(f'\nInstalling required packages from {path}:\n')
     try:
@@ -43,5 +61,7 @@ def install_dependencies(path='requirements.txt') -> None:
             subprocess.check_call([sys.executable, "-m", "pip", "install", package])  # Install
             print(f"[{package}] installation complete")
         print("All packages installed successfully.")
+        return True
     except Exception as e:
         print(f"An error occurred while trying to install packages: {e}")
+        return False
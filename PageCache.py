@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class PageCache:
+    _cache_path = Path.cwd() / 'scrape_cache.sqlite'
+
+    def __init__(self, ttl: int, path: Path = _cache_path):
+        """A persistent on-disk (SQLite) cache of scraped pages, keyed by item type and work order number/request id.
+
+        Args:
+            ttl: Time (in seconds) that a cached page stays valid for
+            path: Path to the SQLite cache file
+        """
+        self.ttl = ttl
+        self.lock = threading.Lock()  # The connection is shared between the scraper's threads
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")  # Allow parallel processes to read while one writes
+        self.connection.execute("""CREATE TABLE IF NOT EXISTS page (
+            item_type TEXT,
+            query TEXT,
+            html BLOB,
+            fetched_at REAL,
+            PRIMARY KEY (item_type, query)
+            )
+            """)
+        self.connection.commit()
+
+    def get(self, item_type: str, query: str) -> bytes | None:
+        """Get a cached page.
+
+        Args:
+            item_type: Type of item ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+
+        Returns:
+            HTML source of the cached page, None if the page is not cached or has expired
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT html FROM page WHERE item_type = ? AND query = ? AND fetched_at > ?",
+                                          (item_type, query, time.time() - self.ttl)).fetchone()
+        return row[0] if row else None
+
+    def put(self, item_type: str, query: str, html: bytes) -> None:
+        """Add (or replace) a cached page.
+
+        Args:
+            item_type: Type of item ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+            html: HTML source of the page
+        """
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO page VALUES (?, ?, ?, ?)",
+                                    (item_type, query, html, time.time()))
+            self.connection.commit()
+
+    def invalidate(self, item_type: str, query: str) -> None:
+        """Remove a page from the cache (so that it is refreshed the next time it is scraped).
+
+        Args:
+            item_type: Type of item ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM page WHERE item_type = ? AND query = ?", (item_type, query))
+            self.connection.commit()
+
+    def close(self) -> None:
+        """Close the connection to the cache."""
+        self.connection.close()
@@ -0,0 +1,205 @@
+import lxml.html
+from lxml.etree import XPath
+from WorkOrder import WorkOrder
+from WorkOrderRequest import WorkOrderRequest
+
+# (<attribute name>, <XPath>) pairs for each field scraped from a work order request page
+REQUEST_FIELDS = (("status", "//tr[3]/td[2]/strong/font"),
+                  ("building", "/html/body/table/tbody/tr[2]/td[2]"),
+                  ("tag", "/html/body/table/tbody/tr[3]/td[2]"),
+                  ("accept_date", "/html/body/table/tbody/tr[4]/td[2]"),
+                  ("reject_date", "/html/body/table/tbody/tr[5]/td[2]"),
+                  ("reject_reason", "/html/body/table/tbody/tr[6]/td[2]"),
+                  ("location", "/html/body/table/tbody/tr[2]/td[4]"),
+                  ("item_description", "/html/body/table/tbody/tr[3]/td[4]"),
+                  ("work_order_num", "/html/body/table/tbody/tr[4]/td[4]"),
+                  ("area_description", "/html/body/table/tbody/tr[5]/td[4]"),
+                  ("requested_action", "/html/body/table/tbody/tr[8]/td[2]"))
+REQUEST_ROOM_XPATH = "//tr[3]/td[1]/p/font/b"
+
+# (<attribute name>, <XPath>) pairs for each field scraped from a work order page (for both page layouts)
+ORDER_FIELDS_LAYOUT_1 = (("facility", "/html/body/table/tbody/tr[6]/td[2]"),
+                         ("building", "/html/body/table/tbody/tr[7]/td[2]"),
+                         ("location_id", "/html/body/table/tbody/tr[8]/td[2]"),
+                         ("priority", "/html/body/table/tbody/tr[9]/td[2]"),
+                         ("request_date", "/html/body/table/tbody/tr[10]/td[2]"),
+                         ("schedule_date", "/html/body/table/tbody/tr[11]/td[2]"),
+                         ("work_status", "/html/body/table/tbody/tr[12]/td[2]"),
+                         ("date_closed", "/html/body/table/tbody/tr[13]/td[2]"),
+                         ("main_charge_account", "/html/body/table/tbody/tr[14]/td[2]"),
+                         ("task_code", "/html/body/table/tbody/tr[15]/td[2]/font"),
+                         ("reference_number", "/html/body/table/tbody/tr[6]/td[4]"),
+                         ("tag_number", "/html/body/table/tbody/tr[8]/td[4]"),
+                         ("item_description", "/html/body/table/tbody/tr[9]/td[4]"),
+                         ("request_time", "/html/body/table/tbody/tr[10]/td[4]"),
+                         ("date_last_posted", "/html/body/table/tbody/tr[11]/td[4]"),
+                         ("trade", "/html/body/table/tbody/tr[12]/td[4]"),
+                         ("contractor_name", "/html/body/table/tbody/tr[13]/td[4]"),
+                         ("est_completion_date", "/html/body/table/tbody/tr[14]/td[4]"),
+                         ("task_description", "/html/body/table/tbody/tr[15]/td[4]"),
+                         ("requested_action", "/html/body/table/tbody/tr[17]/td[2]"),
+                         ("corrective_action", "/html/body/table/tbody/tr[18]/td[2]"))
+ORDER_FIELDS_LAYOUT_2 = (("facility", "/html/body/table/tbody/tr[4]/td[2]"),
+                         ("building", "/html/body/table/tbody/tr[5]/td[2]"),
+                         ("location_id", "/html/body/table/tbody/tr[6]/td[2]"),
+                         ("priority", "/html/body/table/tbody/tr[7]/td[2]"),
+                         ("request_date", "/html/body/table/tbody/tr[8]/td[2]"),
+                         ("schedule_date", "/html/body/table/tbody/tr[9]/td[2]"),
+                         ("work_status", "/html/body/table/tbody/tr[10]/td[2]"),
+                         ("date_closed", "/html/body/table/tbody/tr[11]/td[2]"),
+                         ("main_charge_account", "/html/body/table/tbody/tr[12]/td[2]"),
+                         ("task_code", "/html/body/table/tbody/tr[13]/td[2]"),
+                         ("reference_number", "/html/body/table/tbody/tr[4]/td[4]/p"),
+                         ("tag_number", "/html/body/table/tbody/tr[6]/td[4]"),
+                         ("item_description", "/html/body/table/tbody/tr[7]/td[4]"),
+                         ("request_time", "/html/body/table/tbody/tr[8]/td[4]"),
+                         ("date_last_posted", "/html/body/table/tbody/tr[9]/td[4]"),
+                         ("trade", "/html/body/table/tbody/tr[10]/td[4]"),
+                         ("contractor_name", "/html/body/table/tbody/tr[11]/td[4]"),
+                         ("est_completion_date", "/html/body/table/tbody/tr[12]/td[4]"),
+                         ("task_description", "/html/body/table/tbody/tr[13]/td[4]"),
+                         ("requested_action", "/html/body/table/tbody/tr[15]/td[2]"),
+                         ("corrective_action", "/html/body/table/tbody/tr[16]/td[2]"))
+ORDER_LAYOUT_1_XPATH = "/html/body/table/tbody/tr[6]/td[1]"
+ORDER_LAYOUT_2_XPATH = "/html/body/table/tbody/tr[4]/td[1]"
+RESULT_TABLE_XPATH = "/html/body/table/tbody/tr"  # Rows of the search result frame's table (every field is in it)
+
+# Compiled versions of the XPaths above (compiled once instead of on every lookup)
+_REQUEST_FIELDS = tuple((name, XPath(xpath)) for name, xpath in REQUEST_FIELDS)
+_REQUEST_ROOM_XPATH = XPath(REQUEST_ROOM_XPATH)
+_ORDER_FIELDS_LAYOUT_1 = tuple((name, XPath(xpath)) for name, xpath in ORDER_FIELDS_LAYOUT_1)
+_ORDER_FIELDS_LAYOUT_2 = tuple((name, XPath(xpath)) for name, xpath in ORDER_FIELDS_LAYOUT_2)
+_ORDER_LAYOUT_1_XPATH = XPath(ORDER_LAYOUT_1_XPATH)
+_ORDER_LAYOUT_2_XPATH = XPath(ORDER_LAYOUT_2_XPATH)
+_RESULT_TABLE_XPATH = XPath(RESULT_TABLE_XPATH)
+
+
+class PageParser:
+    """Contains utility functions for parsing work order and work order request pages from HTML (without a browser)."""
+
+    @staticmethod
+    def parse_html(html: str | bytes) -> lxml.html.HtmlElement:
+        """Parse an HTML page into a document tree that matches the browser's DOM closely enough for the scraper's
+        XPaths (<tbody> elements are inserted the same way browsers insert them and <br> tags are kept as newlines).
+
+        Args:
+            html: HTML source of the page
+
+        Returns:
+            The root element of the parsed page
+        """
+        tree = lxml.html.fromstring(html)
+
+        # Browsers wrap table rows in an implicit <tbody> (the scraper's XPaths expect it)
+        for table in tree.iter('table'):
+            rows = [child for child in table if child.tag == 'tr']
+            if rows:
+                tbody = lxml.html.Element('tbody')
+                table.insert(table.index(rows[0]), tbody)
+                tbody.extend(rows)
+
+        # Keep line breaks in element text (as Selenium's WebElement.text does)
+        for br in tree.iter('br'):
+            br.tail = '\n' + (br.tail or '')
+
+        return tree
+
+    @staticmethod
+    def element_text(element: lxml.html.HtmlElement) -> str:
+        """Get the text of an element with whitespace collapsed as it would be rendered by a browser.
+
+        Args:
+            element: Element to get the text of
+
+        Returns:
+            The rendered text of the element
+        """
+        lines = (' '.join(line.split()) for line in element.text_content().splitlines())
+        return '\n'.join(line for line in lines if line)
+
+    @staticmethod
+    def find_xpath_helper(tree: lxml.html.HtmlElement, xpath: XPath) -> str | None:
+        """Find an element by xpath, convert to string, strip spaces and commas.
+
+        Args:
+            tree: Parsed page to find element in
+            xpath: Compiled XPath to find element with
+
+        Returns:
+            String value of element (commas and spaces are stripped), None if no element is found
+        """
+        elements = xpath(tree)
+        if elements:
+            return PageParser.element_text(elements[0]).strip(", ")
+
+    @staticmethod
+    def check_result_page(tree: lxml.html.HtmlElement, query: str) -> None:
+        """Check that a parsed page is a search result page (so that a page without an item's fields can be trusted to
+        mean that the item does not exist, rather than e.g. an error page or a rejected search).
+
+        Args:
+            tree: Parsed page to check
+            query: Work order number or work request id that was searched for
+
+        Raises:
+            Exception: If the page is not a search result page
+        """
+        if not _RESULT_TABLE_XPATH(tree):
+            raise Exception(f"Page for [{query}] is not a search result page")
+
+    @staticmethod
+    def parse_request(html: str | bytes, request_id: int) -> WorkOrderRequest:
+        """Parse a work order request page.
+
+        Args:
+            html: HTML source of the request page
+            request_id: id of the request
+
+        Returns:
+            WorkOrderRequest object containing data about the work request
+
+        Raises:
+            ValueError: If the page is a search result without a work order request (the request does not exist)
+            Exception: If the page is not a search result page
+        """
+        tree = PageParser.parse_html(html)
+
+        request_room = _REQUEST_ROOM_XPATH(tree)
+        if not request_room:
+            PageParser.check_result_page(tree, str(request_id))
+            raise ValueError(f"Failed to find room for work request [{request_id}]")
+        request_room = PageParser.element_text(request_room[0])
+        if request_room.startswith("for "):
+            request_room = request_room[4:]
+
+        values = {name: PageParser.find_xpath_helper(tree, xpath) for name, xpath in _REQUEST_FIELDS}
+        return WorkOrderRequest(request_id, room=request_room, **values)
+
+    @staticmethod
+    def parse_order(html: str | bytes, order_number: str) -> WorkOrder:
+        """Parse a work order page.
+
+        Args:
+            html: HTML source of the order page
+            order_number: Order number of the work order
+
+        Returns:
+            WorkOrder object containing data about the work order
+
+        Raises:
+            ValueError: If the page is a search result without a work order (the order does not exist)
+            Exception: If the page is not a search result page
+        """
+        tree = PageParser.parse_html(html)
+
+        # Work order pages can have one of two different layouts which changes the XPATHs of data
+        if PageParser.find_xpath_helper(tree, _ORDER_LAYOUT_1_XPATH) == 'Facility:':
+            fields = _ORDER_FIELDS_LAYOUT_1
+        elif PageParser.find_xpath_helper(tree, _ORDER_LAYOUT_2_XPATH) == 'Facility:':
+            fields = _ORDER_FIELDS_LAYOUT_2
+        else:
+            PageParser.check_result_page(tree, order_number)
+            raise ValueError(f"Failed to determine page layout for work order [{order_number}]")
+
+        values = {name: PageParser.find_xpath_helper(tree, xpath) for name, xpath in fields}
+        return WorkOrder(order_number, **values)
@@ -1,34 +1,78 @@
-import hashlib
-import os
 import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.common import exceptions
 import User
 from selenium import webdriver
 from WebAutomation import *
 from WorkOrderRequest import *
+from PageParser import PageParser
+from PageCache import PageCache
 from User import *
 
 
 class Scraper:
+    # Chrome profile files/directories that are skipped when cloning the primary scraper's profile
+    _profile_clone_ignore = shutil.ignore_patterns('Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache',
+                                                   'DawnCache', 'DawnGraphiteCache', 'CacheStorage', 'ScriptCache',
+                                                   'Crashpad', 'Singleton*')
+    _page_load_timeout = 15  # Time (in seconds) to wait for a page to load before stopping it
+    _script_timeout = 10  # Time (in seconds) to wait for a script to finish
+    # Cookie fields accepted by DevTools Network.setCookies
+    _cookie_param_keys = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+    _calnet_domain = "auth.berkeley.edu"  # Domain of Calnet's login (CAS) cookies
+
     def __init__(self, chrome_path: Path, chromedriver_path: Path, user: User = None, process_id: int = 0,
-                 headless: bool = True):
+                 headless: bool = True, http_threads: int = 0, cache_ttl: int | None = None,
+                 memo_size: int = 0, memo_ttl: float = 0, cookies: list[dict] | None = None):
         """An automated webscraper for retrieving work order and work order request data.
 
+        The webdriver is used to log into Calnet. If http_threads is set, pages are then fetched over HTTP (reusing the
+        webdriver's session cookies) and parsed without the browser; the webdriver is only used as a fallback.
+
         Args:
             chrome_path: Path pointing to the chrome directory
             chromedriver_path: Path pointing to the chromedriver directory
             user: Calnet user for Calnet login and authorization
             process_id: Unique process id for this scraper (for parallel processing)
             headless: True to run the webdriver in headless mode
+            http_threads: Number of concurrent HTTP requests to scrape with (0 to only scrape with the webdriver)
+            cache_ttl: Time (in seconds) to keep pages fetched over HTTP in the on-disk page cache (None to disable)
+            memo_size: Maximum number of scraped items to remember (in memory) to avoid re-scraping them (0 to disable)
+            memo_ttl: Time (in seconds) that a remembered item is reused for before it is scraped again (0 to keep
+                items until they are evicted)
+            cookies: Browser cookies to start the webdriver with (e.g. another scraper's Calnet login cookies)
         """
         self.chrome_path = chrome_path
         self.chromedriver_path = chromedriver_path
         self.user = user
         self.process_id = process_id
         self.headless = headless
+        self.http_threads = http_threads
+        self.session = None  # Authenticated HTTP session (None if scraping over HTTP is disabled)
+        self.search_forms = {}  # Search form (action, method, fields) for each item type ('WR' or 'WO')
+        self.driver_lock = threading.Lock()  # Webdrivers are not thread-safe
+        self.executor = None  # Thread pool for concurrent HTTP scraping (created on first use)
+        self.page_cache = PageCache(cache_ttl) if cache_ttl is not None else None
+        # Most recently scraped items {(<item type>, <id>): (<time scraped>, <item>)} (least recent first)
+        self.memo = OrderedDict()
+        self.memo_size = memo_size
+        self.memo_ttl = memo_ttl
+        self.memo_lock = threading.Lock()
         self.driver = self.initialize_driver()
-        self.login_calnet()
+        try:
+            if cookies:
+                self.set_browser_cookies(cookies)
+            self.login_calnet()
+        except BaseException:  # Quit the browser if login fails (e.g. times out) so that its profile is not left locked
+            self.close()
+            raise
 
     def initialize_driver(self) -> WebDriver:
         """Initialize the webdriver instance (chromedriver).
@@ -46,28 +90,60 @@ class Scraper:
 
         # Headless mode.
         if self.headless:
-            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--disable-gpu")
+
+        # Reduce the memory used by each browser (so that more parallel scrapers can run at once)
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--window-size=1280,720")  # Open at the final size (instead of resizing)
+
+        # Return from page loads once the DOM is ready (subresources are not needed and every read waits on its
+        # own element)
+        chrome_options.page_load_strategy = 'eager'
+
+        # Don't load images (only the page text is scraped)
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
 
         # Load or create a unique Chrome profile for this webdriver instance:
         # The primary (driver) scraper has process id 0 ("p0")
         # All parallel scrapers copy the primary scraper's Chrome profile to skip Duo Mobile login (using saved cookies)
-        profile_name = hashlib.sha256(self.user.username.encode('utf-8')).hexdigest()
-        profile_path = Path.cwd() / 'Profiles' / f'{profile_name}'
-        profile_instance_path = profile_path / f'p{self.process_id}'  # The profile instance unique to this scraper
-        if not os.path.exists(profile_instance_path):
-            if self.process_id == 0:  # Base scraper/profile
-                os.makedirs(profile_instance_path)
-            else:  # Parallel scraper/profile
-                base_instance_path = profile_path / 'p0'
-                shutil.copytree(base_instance_path, profile_instance_path)  # Duplicate base profile
+        profile_instance_path = Scraper.get_profile_instance_path(self.user, self.process_id)
+        if self.process_id == 0:  # Base scraper/profile
+            profile_instance_path.mkdir(parents=True, exist_ok=True)
+        else:  # Parallel scraper/profile
+            base_instance_path = Scraper.get_profile_instance_path(self.user, 0)
+            try:
+                # Duplicate base profile (caches and process locks are not needed to reuse the saved login)
+                shutil.copytree(base_instance_path, profile_instance_path, ignore=Scraper._profile_clone_ignore)
+            except FileExistsError:
+                pass  # Reuse the existing profile
         chrome_options.add_argument(f"user-data-dir={profile_instance_path}")  # Use this profile for the scraper
 
         # Initialize driver
         driver = webdriver.Chrome(options=chrome_options, service=chrome_service)
-        if not self.headless:
-            driver.set_window_size(1280, 720)
+
+        # Bound the time spent waiting on a stalled page or script. The script timeout only applies to scripts run
+        # through the webdriver (execute_script), scripts run through DevTools (Runtime.evaluate) bound themselves
+        # (see WebAutomation.get_result_html and WebAutomation.fetch_search)
+        driver.set_page_load_timeout(Scraper._page_load_timeout)
+        driver.set_script_timeout(Scraper._script_timeout)
         return driver
 
+    @staticmethod
+    def get_profile_instance_path(user: User, process_id: int) -> Path:
+        """Get the path to the Chrome profile instance used by the scraper with the given process id.
+
+        Args:
+            user: Calnet user the profile belongs to
+            process_id: Process id of the scraper (0 for the primary scraper)
+
+        Returns:
+            Path pointing to the Chrome profile instance directory
+        """
+        return Path.cwd() / 'Profiles' / user.profile_hash / f'p{process_id}'
+
     def login_calnet(self) -> None:
         """Login to the user's Calnet account (and prompt for credentials if necessary).
 
@@ -79,35 +155,396 @@ class Scraper:
 
         WebAutomation.login_calnet(self.driver, self.user)
 
-    def scrape_request(self, request_id: int) -> WorkOrderRequest:
-        """Scrape a single work request.
+        if self.http_threads > 0:
+            self.session = self.export_session()
+            self.search_forms = {}
+
+    def export_session(self) -> requests.Session:
+        """Create an HTTP session authenticated with the webdriver's cookies (for the current domain).
+
+        Returns:
+            An authenticated requests.Session
+        """
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.http_threads))
+        session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent;")
+        for cookie in self.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'),
+                                path=cookie.get('path', '/'))
+        return session
+
+    def http_search(self, item_value: str, query: str) -> bytes:
+        """Submit a search for a work order or work order request over HTTP.
 
         Args:
-            request_id: The id of the work request
+            item_value: Type of item to search for ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+
+        Returns:
+            HTML source of the search result page
+
+        Raises:
+            requests.RequestException: If the request fails or the session is no longer logged in (and logging back
+                in fails)
+        """
+        session = self.session
+        if session is None:  # Disabled by another thread (logging back in failed)
+            raise requests.RequestException(f"HTTP scraping is disabled (searching for [{query}])")
+        response = self.submit_search(session, item_value, query)
+        if "auth.berkeley.edu" in response.url:  # Redirected to Calnet login, log back in and retry once
+            session = self.renew_session(session)
+            response = self.submit_search(session, item_value, query)
+            if "auth.berkeley.edu" in response.url:  # Logging back in did not help, stop scraping over HTTP
+                self.disable_session(session)
+                raise requests.RequestException(f"HTTP session is no longer logged in (searching for [{query}])",
+                                                response=response)
+        return response.content
+
+    def submit_search(self, session: requests.Session, item_value: str, query: str) -> requests.Response:
+        """Submit the search form over HTTP (the search form is read from the webdriver once for each item type).
+
+        Args:
+            session: HTTP session to submit the search with
+            item_value: Type of item to search for ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+
+        Returns:
+            The response to the search
+        """
+        search_form = self.search_forms.get(item_value)
+        if search_form is None:
+            with self.driver_lock:
+                search_form = WebAutomation.get_search_form(self.driver, item_value)
+                self.search_forms[item_value] = search_form
+        action, method, fields = search_form
+
+        fields = dict(fields, WorkOrderNumber=query)
+        if method == 'post':
+            response = session.post(action, data=fields, timeout=30)
+        else:
+            response = session.get(action, params=fields, timeout=30)
+        response.raise_for_status()
+        return response
+
+    def browser_search(self, item_value: str, query: str) -> str:
+        """Submit a search for a work order or work order request from within the webdriver's page (the search result
+        is fetched by the page itself instead of navigating the result frame).
+        NOTE: driver_lock must be held by the caller.
+
+        Args:
+            item_value: Type of item to search for ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+
+        Returns:
+            HTML source of the search result page
+        """
+        search_form = self.search_forms.get(item_value)
+        if search_form is None:
+            search_form = WebAutomation.get_search_form(self.driver, item_value)
+            self.search_forms[item_value] = search_form
+        return WebAutomation.fetch_search(self.driver, search_form, query, timeout=Scraper._script_timeout)
+
+    def renew_session(self, expired_session: requests.Session) -> requests.Session:
+        """Log back into Calnet with the webdriver and replace the expired HTTP session (only once if several threads
+        find that the same session has expired). If logging back in fails, scraping over HTTP is disabled for the rest
+        of the run (items are scraped with the webdriver) instead of logging in again for every item.
+
+        Args:
+            expired_session: The HTTP session that is no longer logged in
+
+        Returns:
+            The renewed HTTP session
+
+        Raises:
+            requests.RequestException: If logging back in fails (or failed in another thread)
+        """
+        with self.driver_lock:
+            if self.session is expired_session:
+                try:
+                    self.login_calnet()
+                except Exception as e:
+                    self.session = None
+                    raise requests.RequestException("failed to log back in, HTTP scraping is disabled") from e
+            if self.session is None:
+                raise requests.RequestException("HTTP scraping is disabled")
+            return self.session
+
+    def disable_session(self, session: requests.Session) -> None:
+        """Stop scraping over HTTP for the rest of the run (items are scraped with the webdriver), e.g. when the HTTP
+        session is still not logged in after logging back in.
+
+        Args:
+            session: The HTTP session to disable (ignored if it has already been replaced)
+        """
+        with self.driver_lock:
+            if self.session is session:
+                print("HTTP session is still not logged in after logging back in ... scraping with the webdriver")
+                self.session = None
+
+    def invalidate_cached_page(self, item_value: str, query: str) -> None:
+        """Remove a page from the page cache (if caching is enabled) so that it is fetched again on the next scrape.
+
+        Args:
+            item_value: Type of item ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+        """
+        if self.page_cache is not None:
+            self.page_cache.invalidate(item_value, query)
+
+    def memo_get(self, key: tuple[str, int | str]) -> WorkOrderRequest | WorkOrder | None:
+        """Get a previously scraped item from the memo of recently scraped items.
+
+        Args:
+            key: Tuple of (<item type>, <request id or order number>)
+
+        Returns:
+            The previously scraped item, None if the item has not been scraped recently (or has expired)
+        """
+        with self.memo_lock:
+            entry = self.memo.get(key)
+            if entry is None:
+                return None
+            scraped_at, item = entry
+            if 0 < self.memo_ttl < time.monotonic() - scraped_at:
+                del self.memo[key]
+                return None
+            self.memo.move_to_end(key)  # Mark as most recently used
+            return item
+
+    def memo_put(self, key: tuple[str, int | str], item: WorkOrderRequest | WorkOrder) -> None:
+        """Add a scraped item to the memo of recently scraped items (evicting the least recently used item if full).
+
+        Args:
+            key: Tuple of (<item type>, <request id or order number>)
+            item: The scraped item
+        """
+        if self.memo_size <= 0:
+            return None
+        with self.memo_lock:
+            self.memo[key] = (time.monotonic(), item)
+            self.memo.move_to_end(key)
+            if len(self.memo) > self.memo_size:
+                self.memo.popitem(last=False)
+
+    def fetch_item(self, item_value: str, query: str, parse: Callable[[str | bytes], WorkOrderRequest | WorkOrder],
+                   scrape: Callable[[WebDriver], WorkOrderRequest | WorkOrder | None]
+                   ) -> WorkOrderRequest | WorkOrder | None:
+        """Fetch and scrape a single work order or work order request. Pages are fetched over HTTP if enabled, falling
+        back to the webdriver only if the HTTP request fails (or the session cannot be logged back in, or the response
+        is not a search result page). The webdriver fetches the search result from within the page, falling back to
+        submitting the search form.
+
+        Args:
+            item_value: Type of item ('WR' for Work Request, 'WO' for Work Order)
+            query: Work order number or work request id
+            parse: Function to parse the item from the HTML of its search result page (raises ValueError if the page
+                is a search result without the item, i.e. the item does not exist)
+            scrape: Function to search for and scrape the item with the webdriver (returns None if the item does not
+                exist)
+
+        Returns:
+            The scraped item, None if the item does not exist
+
+        Raises:
+            Exception: If the item cannot be fetched or scraped
+        """
+        if self.session is not None:
+            cached_html = self.page_cache.get(item_value, query) if self.page_cache is not None else None
+            try:
+                html = cached_html if cached_html is not None else self.http_search(item_value, query)
+            except requests.RequestException as e:
+                print(f"failed to fetch [{query}] over HTTP ({e}) ... retrying with the webdriver")
+            else:
+                try:
+                    item = Scraper.parse_result(parse, html)
+                except Exception as e:  # Not a search result (e.g. an error page), do not keep it and ask the browser
+                    if cached_html is not None:
+                        self.invalidate_cached_page(item_value, query)
+                    print(f"failed to parse [{query}] fetched over HTTP ({e}) ... retrying with the webdriver")
+                else:
+                    # Only pages confirmed to be search results are cached (including results without the item)
+                    if cached_html is None and self.page_cache is not None:
+                        self.page_cache.put(item_value, query, html)
+                    return item
+
+        with self.driver_lock:
+            try:
+                html = self.browser_search(item_value, query)
+            except Exception as e:
+                print(f"failed to fetch [{query}] from within the browser page ({e}) ... submitting the search form")
+                html = None
+            if html is not None:
+                return Scraper.parse_result(parse, html)
+
+            WebAutomation.select_item(self.driver, item_value)
+            return scrape(self.driver)
+
+    @staticmethod
+    def parse_result(parse: Callable[[str | bytes], WorkOrderRequest | WorkOrder],
+                     html: str | bytes) -> WorkOrderRequest | WorkOrder | None:
+        """Parse an item from the HTML of its search result page.
+
+        Args:
+            parse: Function to parse the item (see Scraper.fetch_item())
+            html: HTML source of the search result page
 
         Returns:
-            The scraped work request as a WorkOrderRequest object
+            The parsed item, None if the item does not exist
+
+        Raises:
+            Exception: If the page is not a search result page (or cannot be parsed)
         """
-        WebAutomation.select_item(self.driver, 'WR')
         try:
-            return WebAutomation.scrape_request(self.driver, request_id)
-        except:
-            return WorkOrderRequest(request_id)  # Return an empty request if request cannot be found
+            return parse(html)
+        except ValueError:  # A search result without the item, the item does not exist
+            return None
 
-    def scrape_order(self, order_number: str) -> WorkOrder:
-        """Scrape a single work order.
+    def fetch_request(self, request_id: int) -> WorkOrderRequest | None:
+        """Fetch and scrape a single work request (see Scraper.fetch_item()).
+
+        Args:
+            request_id: The id of the work request
+
+        Returns:
+            The scraped work request as a WorkOrderRequest object, None if the request does not exist
+
+        Raises:
+            Exception: If the request cannot be fetched or scraped
+        """
+        return self.fetch_item('WR', str(request_id),
+                               parse=lambda html: PageParser.parse_request(html, request_id),
+                               scrape=lambda driver: WebAutomation.scrape_request(driver, request_id))
+
+    def fetch_order(self, order_number: str) -> WorkOrder | None:
+        """Fetch and scrape a single work order (see Scraper.fetch_item()).
 
         Args:
             order_number: The order number of the work order
 
         Returns:
-            The scraped work order as a WorkOrder object
+            The scraped work order as a WorkOrder object, None if the order does not exist
+
+        Raises:
+            Exception: If the order cannot be fetched or scraped
         """
-        WebAutomation.select_item(self.driver, 'WO')
-        try:
-            return WebAutomation.scrape_order(self.driver, order_number)
-        except:
-            return WorkOrder(order_number)  # Return an empty work order if none can be found
+        return self.fetch_item('WO', order_number,
+                               parse=lambda html: PageParser.parse_order(html, order_number),
+                               scrape=lambda driver: WebAutomation.scrape_order(driver, order_number))
+
+    def scrape_request(self, request_id: int, force_refresh: bool = False) -> WorkOrderRequest:
+        """Scrape a single work request (requests scraped recently are not scraped again).
+
+        Args:
+            request_id: The id of the work request
+            force_refresh: True to scrape the request again even if it was scraped recently (or is in the page cache)
+
+        Returns:
+            The scraped work request as a WorkOrderRequest object (an empty request if the request does not exist)
+
+        Raises:
+            Exception: If the request cannot be fetched or scraped
+        """
+        key = ('WR', request_id)
+        if force_refresh:
+            request = None
+            self.invalidate_cached_page('WR', str(request_id))
+        else:
+            request = self.memo_get(key)
+        if request is None:
+            request = self.fetch_request(request_id)
+            if request is None:
+                request = WorkOrderRequest(request_id)  # Empty request if the request does not exist
+            self.memo_put(key, request)
+        return request
+
+    def scrape_order(self, order_number: str, force_refresh: bool = False) -> WorkOrder:
+        """Scrape a single work order (orders scraped recently are not scraped again).
+
+        Args:
+            order_number: The order number of the work order
+            force_refresh: True to scrape the order again even if it was scraped recently (or is in the page cache)
+
+        Returns:
+            The scraped work order as a WorkOrder object (an empty work order if the order does not exist)
+
+        Raises:
+            Exception: If the order cannot be fetched or scraped
+        """
+        key = ('WO', order_number)
+        if force_refresh:
+            order = None
+            self.invalidate_cached_page('WO', order_number)
+        else:
+            order = self.memo_get(key)
+        if order is None:
+            order = self.fetch_order(order_number)
+            if order is None:
+                order = WorkOrder(order_number)  # Empty work order if the order does not exist
+            self.memo_put(key, order)
+        return order
+
+    def scrape_requests(self, request_ids: Iterable[int],
+                        on_error: Callable[[int], None] | None = None) -> Iterator[WorkOrderRequest | None]:
+        """Scrape work requests (concurrently if scraping over HTTP). A request that fails to scrape does not stop the
+        remaining requests from being scraped.
+
+        Args:
+            request_ids: Iterable of request ids to scrape
+            on_error: Function called with the id of each request that fails to scrape (from within the except block)
+
+        Returns:
+            Iterator of the scraped work requests (in the same order as request_ids, None for each request that fails
+            to scrape)
+        """
+        return self.scrape_items(self.scrape_request, request_ids, on_error)
+
+    def scrape_orders(self, order_numbers: Iterable[str],
+                      on_error: Callable[[str], None] | None = None) -> Iterator[WorkOrder | None]:
+        """Scrape work orders (concurrently if scraping over HTTP). An order that fails to scrape does not stop the
+        remaining orders from being scraped.
+
+        Args:
+            order_numbers: Iterable of order numbers (WITH PREFIXES) to scrape
+            on_error: Function called with the number of each order that fails to scrape (from within the except block)
+
+        Returns:
+            Iterator of the scraped work orders (in the same order as order_numbers, None for each order that fails to
+            scrape)
+        """
+        return self.scrape_items(self.scrape_order, order_numbers, on_error)
+
+    def scrape_items(self, scrape: Callable, item_ids: Iterable, on_error: Callable | None) -> Iterator:
+        """Scrape items with a scrape function (concurrently if scraping over HTTP), catching the failure of each item.
+
+        Args:
+            scrape: Function to scrape a single item (Scraper.scrape_request or Scraper.scrape_order)
+            item_ids: Iterable of the ids/order numbers of the items to scrape
+            on_error: Function called with the id/order number of each item that fails to scrape
+
+        Returns:
+            Iterator of the scraped items (in the same order as item_ids, None for each item that fails to scrape)
+        """
+        def scrape_item(item_id):
+            try:
+                return scrape(item_id)
+            except Exception:
+                if on_error is not None:
+                    on_error(item_id)
+                return None
+
+        if self.session is None:
+            return map(scrape_item, item_ids)
+        return self.get_executor().map(scrape_item, item_ids)
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for concurrent HTTP scraping (created on first use).
+
+        Returns:
+            The scraper's ThreadPoolExecutor
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.http_threads)
+        return self.executor
 
     def get_cookies(self) -> list[dict]:
         """Get a list of the webdriver cookies that are currently visible (cookies from the current domain).
@@ -117,6 +554,44 @@ class Scraper:
         """
         return self.driver.get_cookies()
 
+    def get_browser_cookies(self, domain: str = None) -> list[dict]:
+        """Get the webdriver's cookies (for every domain, including Calnet's own login cookies). Unlike the cookies
+        saved in the Chrome profile, these include session cookies.
+
+        Args:
+            domain: Only get cookies set for this domain (or its subdomains), gets cookies for every domain if None
+
+        Returns:
+            List of dictionary-representations of cookies (DevTools Network.Cookie objects)
+        """
+        cookies = self.driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        if domain is None:
+            return cookies
+        return [cookie for cookie in cookies if cookie['domain'].lstrip('.') == domain
+                or cookie['domain'].endswith('.' + domain)]
+
+    def get_calnet_cookies(self) -> list[dict]:
+        """Get the webdriver's Calnet login (CAS) cookies, without any of the maintenance site's session cookies.
+
+        Returns:
+            List of dictionary-representations of cookies (DevTools Network.Cookie objects)
+        """
+        return self.get_browser_cookies(domain=Scraper._calnet_domain)
+
+    def set_browser_cookies(self, cookies: list[dict]) -> None:
+        """Add cookies for any domain to the webdriver (no navigation to the cookies' domains is needed).
+
+        Args:
+            cookies: List of dictionary-representations of cookies (from Scraper.get_browser_cookies())
+        """
+        cookie_params = []
+        for cookie in cookies:
+            cookie_param = {key: cookie[key] for key in Scraper._cookie_param_keys if key in cookie}
+            if cookie.get('session'):
+                cookie_param.pop('expires', None)  # Session cookies have no expiration date
+            cookie_params.append(cookie_param)
+        self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookie_params})
+
     def add_cookies(self, cookies: list[dict]) -> None:
         """Add a list of cookies to the webdriver.\n
         NOTE: Selenium only supports adding cookies for the current domain.
@@ -130,6 +605,21 @@ class Scraper:
             except exceptions.InvalidCookieDomainException as e:
                 print(f"failed to add cookie with name [{cookie.get('name')}] (wrong domain)")
 
+    def restart(self) -> None:
+        """Restart the webdriver (closes and relaunches Chrome, then logs back into Calnet with the same session)."""
+        cookies = self.get_browser_cookies()
+        self.driver.quit()
+        self.driver = self.initialize_driver()
+        self.set_browser_cookies(cookies)
+        self.login_calnet()
+
     def close(self) -> None:
-        """Close the webdriver."""
-        self.driver.close()
+        """Close the webdriver (and quit the browser process)."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.session is not None:
+            self.session.close()
+        if self.page_cache is not None:
+            self.page_cache.close()
+        self.driver.quit()
@@ -0,0 +1,247 @@
+import multiprocessing
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import util
+from multiprocessing.synchronize import Barrier
+from pathlib import Path
+from threading import BrokenBarrierError
+from MaintenanceDatabase import MaintenanceDatabase
+from Log import Log
+from User import User
+
+# Worker-process state (each worker process holds exactly one warm database/scraper)
+_database: MaintenanceDatabase | None = None
+_database_kwargs: dict = {}  # Arguments the worker's database/scraper is launched with (to relaunch it)
+_recycle_after = 0  # Number of items to scrape before restarting the worker's browser (0 to never restart)
+_items_since_restart = 0
+_ready_barrier: Barrier | None = None  # Barrier passed once every worker is ready to scrape
+_init_error: BaseException | None = None  # Error raised while initializing the worker (None if it started)
+
+
+def _worker_init(process_ids: multiprocessing.Queue, ready_barrier: Barrier, log: Log, chrome_path: Path,
+                 chromedriver_path: Path, calnet_user: User, headless: bool, db_args: tuple, recycle_after: int,
+                 http_threads: int, cache_ttl: int | None, memo_size: int, memo_ttl: float,
+                 cookies: list[dict] | None) -> None:
+    """Initialize a single worker process: launch its scraper (Chrome + Calnet login) and connect to the database once.
+    The worker's database/scraper is kept alive and reused for every batch of items the worker is given.
+
+    Args:
+        process_ids: Queue of unused process ids (each id corresponds to a unique Chrome profile instance)
+        ready_barrier: Barrier shared by all workers (waited on by ScraperPool's startup tasks)
+        log: Log object for recording progress and error messages
+        chrome_path: Path pointing to the chrome directory to be used for Scrapers
+        chromedriver_path: Path pointing to the chromedriver directory to be used for Scrapers
+        calnet_user: Calnet user used to log into maintenance.housing.berkeley.edu
+        headless: True if this worker's browser should be run headless
+        db_args: Tuple of arguments to connect to the database
+        recycle_after: Number of items to scrape before restarting the worker's browser (0 to never restart)
+        http_threads: Number of concurrent HTTP requests for the worker's scraper to use (0 to only use the browser)
+        cache_ttl: Time (in seconds) for the worker's scraper to keep pages in the on-disk page cache (None to disable)
+        memo_size: Number of recently scraped items for the worker's scraper to remember (0 to disable)
+        memo_ttl: Time (in seconds) for the worker's scraper to remember a scraped item (0 to never expire)
+        cookies: Browser cookies to start the worker's browser with (the primary scraper's login cookies)
+    """
+    global _database, _recycle_after, _ready_barrier, _init_error
+    _recycle_after = recycle_after
+    _ready_barrier = ready_barrier
+    process_id = process_ids.get()  # Check out a Chrome profile instance that is not in use by another worker
+
+    # Close the database/scraper and return the process id when this worker exits
+    util.Finalize(None, _worker_exit, args=(process_ids, process_id), exitpriority=10)
+
+    host, dbname, user, password, port = db_args
+    _database_kwargs.update(log=log, chrome_path=chrome_path, chromedriver_path=chromedriver_path,
+                            calnet_user=calnet_user, process_id=process_id, headless=headless, host=host,
+                            dbname=dbname, user=user, password=password, port=port, http_threads=http_threads,
+                            cache_ttl=cache_ttl, memo_size=memo_size, memo_ttl=memo_ttl, cookies=cookies)
+    try:
+        _database = MaintenanceDatabase(**_database_kwargs)
+    except BaseException as error:
+        # Report the error from _worker_ready instead: an initializer error breaks the executor, which kills the other
+        # workers without running their exit handlers (leaving their browsers running with their profiles locked).
+        # MaintenanceDatabase closes anything it opened before failing
+        _init_error = error
+
+
+def _worker_exit(process_ids: multiprocessing.Queue, process_id: int) -> None:
+    """Close this worker's database/scraper and return its process id to the queue of unused ids.
+
+    Args:
+        process_ids: Queue of unused process ids
+        process_id: The process id held by this worker
+    """
+    if _database is not None:
+        _database.close()
+    process_ids.put(process_id)
+
+
+def _relaunch_database() -> None:
+    """Close this worker's database/scraper and launch a new one with the same arguments (e.g. after its browser fails
+    to restart).
+
+    Raises:
+        Exception: If the new database/scraper fails to launch (the worker is left without a database)
+    """
+    global _database
+    database, _database = _database, None
+    try:
+        database.close()
+    except Exception:  # The browser may already have quit, close the database connection anyway
+        database.connection.close()
+    _database = MaintenanceDatabase(**_database_kwargs)
+
+
+def _add_items(item_type: str, item_ids: range, prefix: str) -> None:
+    """Scrape and add a batch of work order requests or work orders using this worker's warm database/scraper.
+
+    Args:
+        item_type: Type of item to be scraped (either 'request' or 'order')
+        item_ids: Range of work order item ids to be scraped/added (WITHOUT PREFIXES)
+        prefix: Prefix to append to work order numbers (ignored for requests)
+
+    Raises:
+        Exception: If the worker's scraper fails to relaunch after its browser fails to restart
+    """
+    global _items_since_restart
+    if _database is None:
+        raise Exception(f"Worker has no scraper (it failed to relaunch) ... cannot scrape {item_type}s "
+                        f"[{prefix}{item_ids.start}] to [{prefix}{item_ids.stop}]")
+
+    # Restart the browser periodically to avoid memory growth in long-lived Chrome instances
+    if 0 < _recycle_after <= _items_since_restart:
+        _items_since_restart = 0
+        try:
+            _database.scraper.restart()
+        except Exception:  # The browser may be closed or logged out, relaunch the whole scraper
+            _database.log.add(f"failed to restart the browser before scraping {item_type}s [{prefix}{item_ids.start}] "
+                              f"to [{prefix}{item_ids.stop}] ... relaunching the scraper")
+            _database.log.add_quiet(f"{traceback.format_exc()}\n")
+            _relaunch_database()
+    _items_since_restart += len(item_ids)
+
+    try:
+        if item_type == 'request':
+            _database.add_requests(item_ids)
+        elif item_type == 'order':
+            _database.add_orders([prefix + str(item_id) for item_id in item_ids])
+    except KeyboardInterrupt:  # Allows user to exit program to interrupt scraping a large range of items
+        pass
+
+
+def _worker_ready() -> None:
+    """Startup task that blocks until every worker is ready to scrape. Each worker can only take one of these tasks, so
+    they all complete only once every worker has initialized.
+
+    Raises:
+        BaseException: The worker's initialization error if it failed to start (the barrier is aborted first, so the
+            startup tasks of the other workers fail with BrokenBarrierError instead of waiting for this worker)
+    """
+    if _init_error is not None:
+        _ready_barrier.abort()
+        raise _init_error
+    _ready_barrier.wait()
+
+
+class ScraperPool:
+    def __init__(self, log: Log, chrome_path: Path, chromedriver_path: Path, calnet_user: User, db_args: tuple,
+                 num_processes: int, headless: bool = True, recycle_after: int = 0, http_threads: int = 0,
+                 cache_ttl: int | None = None, memo_size: int = 0, memo_ttl: float = 0, batch_size: int = 16,
+                 cookies: list[dict] | None = None):
+        """A persistent pool of parallel worker processes for scraping work order requests and work orders.
+
+        Each worker launches its own scraper (and database connection) once when the pool is created. Workers are kept
+        alive between batches so that Chrome startup and Calnet login are not repeated for every scrape (the
+        configuration is only sent to each worker once, batches are sent as just the item type and id range). A new
+        database object is created for every worker as psycopg2 connections and selenium webdrivers cannot be shared
+        between processes.
+
+        Args:
+            log: Log object for recording progress and error messages
+            chrome_path: Path pointing to the chrome directory to be used for Scrapers
+            chromedriver_path: Path pointing to the chromedriver directory to be used for Scrapers
+            calnet_user: Calnet user used to log into maintenance.housing.berkeley.edu
+            db_args: Tuple of arguments to connect to the database
+            num_processes: Number of parallel worker processes (and scrapers) to launch
+            headless: True to run the workers' browsers in headless mode
+            recycle_after: Number of items each worker scrapes before restarting its browser (0 to never restart)
+            http_threads: Number of concurrent HTTP requests for each worker's scraper (0 to only use the browser)
+            cache_ttl: Time (in seconds) for each worker's scraper to keep pages in the page cache (None to disable)
+            memo_size: Number of recently scraped items for each worker's scraper to remember (0 to disable)
+            memo_ttl: Time (in seconds) for each worker's scraper to remember a scraped item (0 to never expire)
+            batch_size: Number of items workers take at a time
+            cookies: Calnet login cookies to start each worker's browser with (so workers reuse an existing Calnet
+                login instead of logging in again, Chrome profiles do not keep session cookies). Only Calnet's own
+                cookies should be passed so that each worker logs into its own maintenance site session
+
+        Raises:
+            BrokenProcessPool: If a worker fails to launch its scraper (or connect to the database)
+            KeyboardInterrupt: If startup is interrupted (workers that did start are shut down first)
+        """
+        self.num_processes = num_processes
+        self.headless = headless
+        self.batch_size = max(batch_size, 1)  # Batches are split with range(), which cannot step by 0
+
+        # Each worker checks out a unique process id (and Chrome profile instance)
+        # Process 0 is reserved for the primary (driver) database
+        process_ids = multiprocessing.Queue()
+        for process_id in range(1, num_processes + 1):
+            process_ids.put(process_id)
+
+        ready_barrier = multiprocessing.Barrier(num_processes)
+
+        self.executor = ProcessPoolExecutor(max_workers=num_processes, initializer=_worker_init,
+                                            initargs=(process_ids, ready_barrier, log, chrome_path, chromedriver_path,
+                                                      calnet_user, headless, db_args, recycle_after, http_threads,
+                                                      cache_ttl, memo_size, memo_ttl, cookies))
+
+        # Workers are only launched once tasks are submitted
+        # Wait for every worker to finish launching its scraper (workers clone the primary scraper's Chrome profile)
+        futures = [self.executor.submit(_worker_ready) for _ in range(num_processes)]
+        try:
+            wait(futures)
+        except BaseException:  # Interrupted (e.g. KeyboardInterrupt), stop every worker once its scraper is closed
+            ready_barrier.abort()  # Release the workers waiting on the barrier
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            # A worker failed to start, stop every worker (workers close their scrapers as they exit)
+            self.executor.shutdown(wait=True)
+            # Report the worker's own error rather than the other workers' aborted barrier waits
+            error = next((error for error in errors if not isinstance(error, BrokenBarrierError)), errors[0])
+            if isinstance(error, BrokenProcessPool):  # A worker process died
+                raise error
+            raise BrokenProcessPool("A parallel scraper failed to start") from error
+
+    def add_item_range(self, item_type: str, start: int, stop: int, prefix: str = "") -> None:
+        """Scrape and add a range of work order requests or work orders to the database (in parallel).
+
+        The range is split into small contiguous batches that idle workers take one at a time, so workers that get
+        quick (e.g. empty) items keep taking more work instead of waiting on slower workers. Batches are passed as
+        ranges (prefixes are added to order numbers by the workers themselves).
+
+        Args:
+            item_type: Type of item to be scraped (either 'request' or 'order')
+            start: First item id to scrape/add (inclusive)
+            stop: Last item id to scrape/add (exclusive)
+            prefix: Prefix to append to work order numbers (leave empty for requests)
+
+        Raises:
+            KeyboardInterrupt: If the scrape is interrupted (the pool is shut down and cannot be used again)
+            Exception: If a batch fails, e.g. a worker's scraper fails to relaunch (the pool is shut down and cannot be
+                used again)
+        """
+        batches = [range(batch_start, min(batch_start + self.batch_size, stop))
+                   for batch_start in range(start, stop, self.batch_size)]
+        futures = [self.executor.submit(_add_items, item_type, item_ids, prefix) for item_ids in batches]
+        try:
+            for future in futures:
+                future.result()  # Wait for all batches to complete (and raise any errors)
+        except BaseException:  # Stop handing out batches (workers stop their current batch on an interrupt)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def close(self) -> None:
+        """Shut down all workers (closing their scrapers and database connections)."""
+        self.executor.shutdown(wait=True)
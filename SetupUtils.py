@@ -1,8 +1,11 @@
+import functools
 import os
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 import platform
 import sys
 from Menu import Menu
@@ -15,10 +18,18 @@ class SetupUtils:
     _known_good_versions_with_downloads = "known-good-versions-with-downloads.json"
     _browser_path = Path.cwd() / 'Browser'
     _profiles_path = Path.cwd() / 'Profiles'
+    _download_block_size = 1024 * 1024  # 1 MiB
+    _supported_platforms = {("Windows", True): "win64",  # (<system>, <is 64-bit>) for Windows/Linux
+                            ("Windows", False): "win32",
+                            ("Linux", True): "linux64",
+                            ("Darwin", "x86_64"): "mac-x64",  # (<system>, <machine>) for Mac
+                            ("Darwin", "arm64"): "mac-arm64"}
 
     @staticmethod
+    @functools.cache
     def get_platform() -> str:
-        """Automatically detect the user's current platform (operating system).
+        """Automatically detect the user's current platform (operating system). The result is cached after the first
+        call.
 
         Prompt the user to manually select platform if the detected platform is incompatible.
 
@@ -26,36 +37,56 @@ class SetupUtils:
             User's current platform
         """
         system = platform.system()
-        machine = platform.machine()
-        is_64bits = sys.maxsize > 2 ** 32
+        if system == "Darwin":
+            key = (system, platform.machine())
+        else:
+            key = (system, sys.maxsize > 2 ** 32)  # 64-bit or 32-bit
 
-        if system == "Windows":
-            if is_64bits:
-                return "win64"
-            else:
-                return "win32"
-        elif system == "Darwin":
-            if machine == "x86_64":
-                return "mac-x64"
-            elif machine == "arm64":
-                return "mac-arm64"
-        elif system == "Linux":
-            if is_64bits:
-                return "linux64"
+        user_platform = SetupUtils._supported_platforms.get(key)
+        if user_platform is not None:
+            return user_platform
 
         #  Unsupported/undetected: manual input
-        else:
-            options = ["linux64",
-                       "mac-arm64",
-                       "mac-x64",
-                       "win32",
-                       "win64"]
+        options = ["linux64",
+                   "mac-arm64",
+                   "mac-x64",
+                   "win32",
+                   "win64"]
 
-            selected_option = Menu.menu_prompt(options, title="Platform detection failed or platform not supported.\n"
-                                                              "Please manually select a supported platform from the "
-                                                              "list below:")
+        selected_option = Menu.menu_prompt(options, title="Platform detection failed or platform not supported.\n"
+                                                          "Please manually select a supported platform from the "
+                                                          "list below:")
 
-            return options[selected_option]
+        return options[selected_option]
+
+    @staticmethod
+    @functools.cache
+    def get_session() -> requests.Session:
+        """Get the HTTP session shared by all setup requests (created on the first call), so that version lookups and
+        downloads reuse pooled connections instead of opening a new connection for every request.
+
+        Returns:
+            The shared HTTP session
+        """
+        session = requests.Session()
+        # Chrome and chromedriver are downloaded in parallel, keep a connection open for each
+        session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=2))
+        return session
+
+    @staticmethod
+    @functools.cache
+    def fetch_json(endpoint: str) -> dict:
+        """Fetch and parse a JSON endpoint (responses are cached so each endpoint is only fetched once per run).
+
+        Args:
+            endpoint: url of the JSON endpoint
+
+        Returns:
+            The parsed JSON response
+        """
+        response = SetupUtils.get_session().get(endpoint)
+        response.raise_for_status()
+        return response.json()
 
     @staticmethod
     def get_download_link(item: str, version: str, user_platform: str) -> str:
@@ -74,9 +105,7 @@ class SetupUtils:
         """
         print(f"Fetching download link for [{item}] version [{version}] on [{user_platform}] ...")
         endpoint = SetupUtils._chrome_for_testing_url + SetupUtils._known_good_versions_with_downloads
-        response = requests.get(endpoint)
-        response.raise_for_status()
-        versions_json = response.json()  # JSON object of all latest versions
+        versions_json = SetupUtils.fetch_json(endpoint)  # JSON object of all latest versions
 
         # Find matching version and return
         for curr_version in versions_json['versions']:
@@ -103,9 +132,7 @@ class SetupUtils:
         """
         print(f"Fetching download link for latest [{channel}] [{user_platform}] version of [{item}] ...")
         endpoint = SetupUtils._chrome_for_testing_url + SetupUtils._last_known_good_versions_with_downloads
-        response = requests.get(endpoint)
-        response.raise_for_status()
-        latest_json = response.json()  # JSON object of all latest versions
+        latest_json = SetupUtils.fetch_json(endpoint)  # JSON object of all latest versions
         version = latest_json['channels'][channel]['version']
         downloads = latest_json['channels'][channel]['downloads'][item]
 
@@ -116,6 +143,36 @@ class SetupUtils:
                 print(f"Download link for [{item}] version [{version}]: {url}")
                 return version, url
 
+    @staticmethod
+    def download_and_extract(session: requests.Session, item: str, version: str, url: str, extract_dir: Path) -> None:
+        """Download and unzip a single item (e.g. Chrome or chromedriver) to the specified directory.
+
+        Args:
+            session: HTTP session to download with
+            item: Name of the item to download (e.g. 'chrome', 'chromedriver')
+            version: Version of the item to download
+            url: Download link for the item
+            extract_dir: Directory to extract the item to
+        """
+        with session.get(url, stream=True) as response:
+            response.raise_for_status()
+            download_file = extract_dir.with_name(f'{extract_dir.name}-{item}.tmp')  # Construct download file
+
+            print(f"Downloading [{item}] version [{version}] to {download_file} ...")
+            # Stream response content to local file (in large blocks to limit per-chunk overhead)
+            response.raw.decode_content = True
+            with open(download_file, 'wb') as file:
+                shutil.copyfileobj(response.raw, file, length=SetupUtils._download_block_size)
+            download_file = download_file.rename(download_file.with_suffix('.zip'))  # .zip extension
+            print(f"[{item}] version [{version}] download complete.")
+
+        # Unzip file and delete archive
+        print(f"Extracting {download_file} ...")
+        with zipfile.ZipFile(download_file, 'r') as zip_item:
+            zip_item.extractall(extract_dir)
+        download_file.unlink()
+        print(f"[{item}] extraction complete.")
+
     @staticmethod
     def download_browser_items(version: str = None, download_dir: Path = _browser_path, channel: str = None,
                                user_platform: str = None) -> str:
@@ -130,33 +187,27 @@ class SetupUtils:
         Returns:
             Version number of download (e.g. 125-0-6422-78)
         """
-        # Download items
+        # Find download links for all items (all items must be the same version)
+        urls = {}
         for item in ('chrome', 'chromedriver'):
             if version is None:
-                version, url = SetupUtils.get_latest_download_link(item, channel=channel, user_platform=user_platform)
+                version, urls[item] = SetupUtils.get_latest_download_link(item, channel=channel,
+                                                                          user_platform=user_platform)
             else:
-                url = SetupUtils.get_download_link(item, version, user_platform=user_platform)
-
-            version_dash = version.replace('.', '-')  # Rename version number for filename compatibility
-
-            with requests.get(url, stream=True) as response:
-                response.raise_for_status()
-                download_file = (download_dir / version_dash).with_suffix('.tmp')  # Construct download file
+                urls[item] = SetupUtils.get_download_link(item, version, user_platform=user_platform)
 
-                print(f"Downloading [{item}] version [{version}] to {download_file} ...")
-                # Write response content to local file
-                with open(download_file, 'wb') as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        file.write(chunk)
-                download_file = download_file.rename((download_dir / version_dash).with_suffix('.zip'))  # .zip extension
-                print(f"[{item}] version [{version}] download complete.")
+        version_dash = version.replace('.', '-')  # Rename version number for filename compatibility
+        extract_dir = download_dir / version_dash
+        # Create the shared extraction directory up front (parallel extractions would race to create it)
+        extract_dir.mkdir(parents=True, exist_ok=True)
 
-                # Unzip file and delete archive
-                print(f"Extracting {download_file} ...")
-                with zipfile.ZipFile(download_file, 'r') as zip_item:
-                    zip_item.extractall(download_dir / version_dash)
-                download_file.unlink()
-                print(f"Extraction complete.")
+        # Download and extract items in parallel (items are independent of each other)
+        session = SetupUtils.get_session()
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            futures = [executor.submit(SetupUtils.download_and_extract, session, item, version, url, extract_dir)
+                       for item, url in urls.items()]
+            for future in futures:
+                future.result()  # Wait for all downloads to complete (and raise any errors)
 
         return version_dash
 
@@ -240,7 +291,8 @@ class SetupUtils:
 
         # Stage 2: Postgres Setup
         print()
-        print("Please set up and connect a PostgreSQL database as explained in readme Section 2.2 before moving forward.\n"
+        print("Please set up and connect a PostgreSQL database as explained in readme Section 2.2 before moving "
+              "forward.\n"
               "Once you have set up and connected your Postgres database, input \"COMPLETE\" below to continue:\n")
         user_in = ''
         database_setup_complete = False  # Ensure b_database_setup_complete is set to 'true' in config
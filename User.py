@@ -1,4 +1,4 @@
-from pwinput import pwinput
+import hashlib
 from Menu import Menu
 
 
@@ -12,6 +12,7 @@ class User:
         """
         self.username = username
         self.password = password
+        self.profile_hash = hashlib.sha256(username.encode('utf-8')).hexdigest()  # Name of this user's Chrome profile
 
 
 def login_prompt(hidden: bool = True) -> User:
@@ -25,6 +26,7 @@ def login_prompt(hidden: bool = True) -> User:
     """
     new_username = input("Username: ")
     if hidden:
+        from pwinput import pwinput
         new_password = pwinput(prompt="Password: ")
     else:
         new_password = input("Password: ")
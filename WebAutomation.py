@@ -1,3 +1,6 @@
+import json
+from weakref import WeakKeyDictionary
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchFrameException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -6,11 +9,66 @@ from selenium.webdriver.support.ui import Select
 from User import User
 from WorkOrder import WorkOrder
 from WorkOrderRequest import WorkOrderRequest
+from PageParser import PageParser, REQUEST_ROOM_XPATH, ORDER_LAYOUT_1_XPATH, ORDER_LAYOUT_2_XPATH
 
 
 class WebAutomation:
     """Contains utility functions for Chrome automation using Selenium."""
 
+    _maintenance_title = "TMA iServiceDesk - University of California-Berkeley"  # Title of the logged-in site
+
+    # Script that waits for a new search result to load in the search result frame and returns the frame's HTML
+    # (returned pages are marked so that a previous result is never returned again while the next one is loading)
+    _result_html_script = """async (anchors, timeout) => {
+        const frame = window.frames['botright'];
+        const find = (xpath) => frame.document.evaluate(xpath, frame.document, null,
+                                                        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        const deadline = Date.now() + timeout;
+        while (frame.document.scraped || !anchors.some(find)) {
+            if (Date.now() > deadline) {
+                return null;
+            }
+            await new Promise(resolve => setTimeout(resolve, 50));
+        }
+        frame.document.scraped = true;
+        return frame.document.documentElement.outerHTML;
+    }"""
+
+    # Script that submits a search form with fetch() and returns the HTML of the search result
+    _fetch_search_script = """async (action, method, fields, timeout) => {
+        const controller = new AbortController();
+        const timer = setTimeout(() => controller.abort(), timeout);
+        try {
+            const body = new URLSearchParams(fields);
+            const response = method === 'post'
+                ? await fetch(action, {method: 'POST', body: body, credentials: 'include', signal: controller.signal})
+                : await fetch(action + (action.includes('?') ? '&' : '?') + body,
+                              {credentials: 'include', signal: controller.signal});
+            if (!response.ok) {
+                throw new Error(`search failed with status ${response.status}`);
+            }
+            if (new URL(response.url).hostname === 'auth.berkeley.edu') {
+                throw new Error('browser is no longer logged in');
+            }
+            const charset = (response.headers.get('content-type') || '').match(/charset=([^;]+)/i);
+            return new TextDecoder(charset ? charset[1].trim() : 'utf-8').decode(await response.arrayBuffer());
+        } finally {
+            clearTimeout(timer);
+        }
+    }"""
+
+    # Sidebar elements of each webdriver (see WebAutomation.get_sidebar)
+    _sidebars = WeakKeyDictionary()
+
+    # Script that reads the search form's action url, method, fields and submit button name (in the current frame)
+    _search_form_script = """
+        const form = document.evaluate("//select[@name='Search']/ancestor::form", document, null,
+                                       XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        const submit = document.querySelector("input[src='images/arrowbutton.gif']");
+        return [form.action, (form.method || 'get').toLowerCase(), Array.from(new FormData(form).entries()),
+                submit ? submit.name : null];
+    """
+
     @staticmethod
     def login_calnet(driver: WebDriver, user: User, duo_wait_time: float = 5.0) -> None:
         """Complete the Calnet login and Duo Mobile confirmation for UC Berkeley's maintenance site.
@@ -24,7 +82,11 @@ class WebAutomation:
             True if login is successful, False otherwise
         """
         url = "https://auth.berkeley.edu/cas/login?service=https://maintenance.housing.berkeley.edu/cas2/login.aspx"
-        driver.get(url)
+        WebAutomation._sidebars.pop(driver, None)  # Leaving the page (and the sidebar frame)
+        try:
+            driver.get(url)
+        except TimeoutException:  # Stop loading the page (the login form is usually already usable)
+            driver.execute_script("window.stop();")
 
         if driver.title == "CAS - Central Authentication Service":
             # Prompt user for Calnet login credentials
@@ -35,14 +97,50 @@ class WebAutomation:
             driver.find_element(By.ID, "submit").click()
 
         try:  # Duo Mobile confirmation is bypassed (already completed in a previous session)
-            WebDriverWait(driver, duo_wait_time).until(EC.title_is("TMA iServiceDesk - University of "
-                                                                   "California-Berkeley"))
-        except:  # Wait for user to confirm login on the Duo Mobile app
+            WebDriverWait(driver, duo_wait_time).until(EC.title_is(WebAutomation._maintenance_title))
+        except TimeoutException:  # Wait for user to confirm login on the Duo Mobile app
             if driver.title == "Duo Security":
                 print('---CONFIRM LOGIN ON DUO MOBILE---')
                 WebDriverWait(driver, 60).until(EC.presence_of_element_located((By.ID, "trust-browser-button"))).click()
+                # Wait for the redirect back to the maintenance site (so that its cookies are set once this returns)
+                WebDriverWait(driver, 30).until(EC.title_is(WebAutomation._maintenance_title))
                 print('---LOGIN CONFIRMED---')
 
+    @staticmethod
+    def get_sidebar(driver: WebDriver) -> dict:
+        """Switch to the maintenance tracking sidebar (frame 'botleft') and get the elements used for searches.
+        Elements are only found once per page load and are reused for every search. The webdriver is kept in the
+        sidebar frame between searches (search results are read from the top-level page), so repeated searches don't
+        switch frames.
+
+        Args:
+            driver: Selenium webdriver instance to get the sidebar of
+
+        Returns:
+            Dictionary of the sidebar's elements {'dropdown': <Select>, 'search_box': <element>,
+            'submit_button': <element>}
+        """
+        sidebar = WebAutomation._sidebars.get(driver)
+        if sidebar is not None:  # Already in the sidebar frame
+            return sidebar
+
+        driver.switch_to.default_content()
+        try:  # Wait for the sidebar to load
+            botleft = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "botleft")))
+            driver.switch_to.frame(botleft)
+        except TimeoutException:
+            print("frame 'botleft' could not be found or switched to")
+            raise
+
+        # Pages are returned before they finish loading, wait for the dropdown menu
+        dropdown = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.XPATH, "//select[@name='Search']")))
+        sidebar = {'dropdown': Select(dropdown),
+                   'search_box': driver.find_element(By.NAME, "WorkOrderNumber"),
+                   'submit_button': driver.find_element(By.XPATH, "//input[@src='images/arrowbutton.gif']")}
+        WebAutomation._sidebars[driver] = sidebar
+        return sidebar
+
     @staticmethod
     def select_item(driver: WebDriver, item_value: str) -> None:
         """Select "Work Request" or "Work Order" from the maintenance tracking dropdown menu.
@@ -51,15 +149,11 @@ class WebAutomation:
             driver: Selenium webdriver instance for automated selection
             item_value: Value of item to be selected from dropdown menu ('WR' for Work Request, 'WO' for Work Order)
         """
-        try:  # Wait for the sidebar to load
-            driver.switch_to.default_content()
-            WebDriverWait(driver, 10).until(EC.frame_to_be_available_and_switch_to_it((By.NAME, "botleft")))
-        except:
-            print("frame 'botleft' could not be found or switched to")
-
-        # Select item from dropdown menu
-        dropdown_select = Select(driver.find_element(By.XPATH, "//select[@name='Search']"))
-        dropdown_select.select_by_value(item_value)
+        try:
+            WebAutomation.get_sidebar(driver)['dropdown'].select_by_value(item_value)
+        except (StaleElementReferenceException, NoSuchFrameException):  # The page was reloaded, find the sidebar again
+            WebAutomation._sidebars.pop(driver, None)
+            WebAutomation.get_sidebar(driver)['dropdown'].select_by_value(item_value)
 
     @staticmethod
     def search_item(driver: WebDriver, query: str) -> None:
@@ -69,102 +163,114 @@ class WebAutomation:
             driver: Selenium webdriver instance for automated search
             query: Work order number or work request id
         """
-        search_box = driver.find_element(By.NAME, "WorkOrderNumber")
-        search_box.clear()
-        search_box.send_keys(query)
-
-        submit_button = driver.find_element(By.XPATH, "//input[@src='images/arrowbutton.gif']")
-        submit_button.click()
-
-        driver.switch_to.default_content()
-        driver.switch_to.frame("botright")
+        sidebar = WebAutomation.get_sidebar(driver)
+        sidebar['search_box'].clear()
+        sidebar['search_box'].send_keys(query)
+        try:
+            sidebar['submit_button'].click()
+        except TimeoutException:  # Stop loading the search result (it is read once its anchor element has loaded)
+            driver.execute_script("window.top.stop();")  # The driver is in the sidebar frame
 
     @staticmethod
-    def find_xpath_helper(driver: WebDriver, xpath: str, wait_time: float = 3.0) -> str | None:
-        """Find an element by xpath, convert to string, strip spaces commas.
-        NOT intended for use outside WebAutomation.scrape_request()!
+    def get_search_form(driver: WebDriver, item_value: str) -> tuple[str, str, dict]:
+        """Read the search form from the maintenance tracking sidebar (so that searches can be submitted over HTTP
+        without the browser).
 
         Args:
-            driver: Selenium webdriver to find element in
-            xpath: XPath to find element with
-            wait_time: Time to wait (in seconds) for element to load if initial search fails
+            driver: Selenium webdriver instance to read the form with
+            item_value: Value of item to be selected from dropdown menu ('WR' for Work Request, 'WO' for Work Order)
 
         Returns:
-            String value of element (commas and spaces are stripped)
+            Tuple of (<form action url>, <form method>, <dictionary of form fields>)
         """
-        try:
-            return WebDriverWait(driver, 1).until(EC.presence_of_element_located((By.XPATH, xpath))).text.strip(", ")
-        except Exception as e:
-            print(f"failed to find element at XPATH: '{xpath}':")
-            print(e)
+        WebAutomation.select_item(driver, item_value)
+        action, method, fields, submit_name = driver.execute_script(WebAutomation._search_form_script)
+
+        # Image submit buttons send the coordinates of the click (if the button is named)
+        fields = dict(fields)
+        if submit_name:
+            fields[submit_name + '.x'] = '0'
+            fields[submit_name + '.y'] = '0'
+
+        return action, method, fields
 
     @staticmethod
-    def scrape_request(driver: WebDriver, request_id: int) -> WorkOrderRequest:
-        """Submit a search for a single work order request.
+    def get_result_html(driver: WebDriver, anchors: list[str], wait_time: float = 3.0) -> str | None:
+        """Get the HTML of the search result frame ('botright') in a single round trip to the browser (a single
+        DevTools Runtime.evaluate command), so that the page can be parsed locally with PageParser. The webdriver's
+        script timeout does not apply to DevTools commands, so the script stops waiting after wait_time.
 
         Args:
-            driver: Selenium webdriver to automate search for
-            request_id: id of the request to search for
+            driver: Selenium webdriver instance to get the search result from
+            anchors: XPaths of elements to wait for (a new page is considered loaded once any of them are found)
+            wait_time: Time to wait (in seconds) for an anchor element to load
 
         Returns:
-            WorkOrderRequest object containing data about the work request
-        """
-        WebAutomation.search_item(driver, str(request_id))
+            HTML source of the search result frame, None if no new page with an anchor element is loaded before
+            wait_time runs out
 
-        request = WorkOrderRequest(request_id)
-
-        # Scrape data
-        request_room = driver.find_element(By.XPATH, "//tr[3]/td[1]/p/font/b").text
-        if request_room.startswith("for "):
-            request_room = request_room[4:]
-        request.room = request_room
-        request.status = WebAutomation.find_xpath_helper(driver, "//tr[3]/td[2]/strong/font")
-        request.building = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[2]/td[2]")
-        request.tag = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[3]/td[2]")
-        request.accept_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[4]/td[2]")
-        request.reject_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[5]/td[2]")
-        request.reject_reason = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[6]/td[2]")
-        request.location = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[2]/td[4]")
-        request.item_description = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[3]/td[4]")
-        request.work_order_num = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[4]/td[4]")
-        request.area_description = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[5]/td[4]")
-        request.requested_action = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[8]/td[2]")
-
-        return request
+        Raises:
+            Exception: If the script fails to run in the browser
+        """
+        expression = f"({WebAutomation._result_html_script})({json.dumps(anchors)}, {int(wait_time * 1000)})"
+        response = driver.execute_cdp_cmd('Runtime.evaluate', {'expression': expression, 'returnByValue': True,
+                                                               'awaitPromise': True})
+        if 'exceptionDetails' in response:
+            raise Exception(f"failed to get search result: {response['exceptionDetails'].get('text')}")
+        return response['result'].get('value')
 
     @staticmethod
-    def get_page_layout(driver: WebDriver, order_number: str) -> int:
-        """Determine the page layout type of the current work order.
-        (Work order pages can have one of two different layouts which changes the XPATHs of data.)
+    def fetch_search(driver: WebDriver, search_form: tuple[str, str, dict], query: str, timeout: float = 10.0) -> str:
+        """Submit a search for a work order or work order request from within the maintenance site's page (with
+        fetch(), in a single round trip to the browser) without navigating the search result frame. The webdriver's
+        script timeout does not apply to DevTools commands, so the request is aborted by the script itself.
 
         Args:
             driver: Selenium webdriver instance to search with
-            order_number: Work order number to search for
+            search_form: Tuple of (<form action url>, <form method>, <dictionary of form fields>) from
+                WebAutomation.get_search_form()
+            query: Work order number or work request id
+            timeout: Time to wait (in seconds) for the search result before aborting the request
+
         Returns:
-            1 if the page layout corresponds to the first scrape_order clause
-            2 if the page layout corresponds to the second scrape_order clause
+            HTML source of the search result page
+
         Raises:
-            Exception if the page layout cannot be determined
+            Exception: If the search fails or times out (or the browser is no longer logged in)
         """
+        action, method, fields = search_form
+        fields = dict(fields, WorkOrderNumber=query)
+        expression = (f"({WebAutomation._fetch_search_script})"
+                      f"({json.dumps(action)}, {json.dumps(method)}, {json.dumps(fields)}, {int(timeout * 1000)})")
+        response = driver.execute_cdp_cmd('Runtime.evaluate', {'expression': expression, 'returnByValue': True,
+                                                               'awaitPromise': True})
+        if 'exceptionDetails' in response:
+            raise Exception(f"failed to search for [{query}]: {response['exceptionDetails'].get('text')}")
+        return response['result']['value']
+
+    @staticmethod
+    def scrape_request(driver: WebDriver, request_id: int) -> WorkOrderRequest | None:
+        """Submit a search for a single work order request.
+
+        Args:
+            driver: Selenium webdriver to automate search for
+            request_id: id of the request to search for
+
+        Returns:
+            WorkOrderRequest object containing data about the work request, None if the request does not exist
+        """
+        WebAutomation.search_item(driver, str(request_id))
+
+        html = WebAutomation.get_result_html(driver, anchors=[REQUEST_ROOM_XPATH])
+        if html is None:  # No result page loaded
+            return None
         try:
-            if WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[6]/td[1]") == 'Facility:':
-                return 1  # Layout 1
-            elif WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[4]/td[1]") == 'Facility:':
-                return 2  # Layout 2
-            else:
-                raise Exception(f"Failed to determine page layout for work order [{order_number}]")
-        except Exception as e1:
-            try:
-                if WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[4]/td[1]") == 'Facility:':
-                    return 2  # Layout 2
-                else:
-                    raise Exception(f"Failed to determine page layout for work order [{order_number}]")
-            except Exception as e2:
-                print(f"Failed to determine page layout for work order [{order_number}]:")
-                print(e2)
+            return PageParser.parse_request(html, request_id)
+        except ValueError:  # Not a work order request page
+            return None
 
     @staticmethod
-    def scrape_order(driver: WebDriver, order_number: str) -> WorkOrder:
+    def scrape_order(driver: WebDriver, order_number: str) -> WorkOrder | None:
         """Submit a search for a single work order.
 
         Args:
@@ -172,57 +278,15 @@ class WebAutomation:
             order_number: id of the request to search for
 
         Returns:
-            WorkOrder object containing data about the work order
+            WorkOrder object containing data about the work order, None if the order does not exist
         """
         WebAutomation.search_item(driver, order_number)
-        order = WorkOrder(order_number)
-        order.order_number = order_number
-
-        page_layout = WebAutomation.get_page_layout(driver, order_number)
-        # Scrape data
-        if page_layout == 1:
-            order.facility = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[6]/td[2]")
-            order.building = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[7]/td[2]")
-            order.location_id = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[8]/td[2]")
-            order.priority = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[9]/td[2]")
-            order.request_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[10]/td[2]")
-            order.schedule_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[11]/td[2]")
-            order.work_status = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[12]/td[2]")
-            order.date_closed = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[13]/td[2]")
-            order.main_charge_account = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[14]/td[2]")
-            order.task_code = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[15]/td[2]/font")
-            order.reference_number = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[6]/td[4]")
-            order.tag_number = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[8]/td[4]")
-            order.item_description = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[9]/td[4]")
-            order.request_time = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[10]/td[4]")
-            order.date_last_posted = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[11]/td[4]")
-            order.trade = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[12]/td[4]")
-            order.contractor_name = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[13]/td[4]")
-            order.est_completion_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[14]/td[4]")
-            order.task_description = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[15]/td[4]")
-            order.requested_action = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[17]/td[2]")
-            order.corrective_action = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[18]/td[2]")
-        elif page_layout == 2:
-            order.facility = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[4]/td[2]")
-            order.building = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[5]/td[2]")
-            order.location_id = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[6]/td[2]")
-            order.priority = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[7]/td[2]")
-            order.request_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[8]/td[2]")
-            order.schedule_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[9]/td[2]")
-            order.work_status = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[10]/td[2]")
-            order.date_closed = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[11]/td[2]")
-            order.main_charge_account = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[12]/td[2]")
-            order.task_code = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[13]/td[2]")
-            order.reference_number = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[4]/td[4]/p")
-            order.tag_number = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[6]/td[4]")
-            order.item_description = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[7]/td[4]")
-            order.request_time = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[8]/td[4]")
-            order.date_last_posted = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[9]/td[4]")
-            order.trade = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[10]/td[4]")
-            order.contractor_name = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[11]/td[4]")
-            order.est_completion_date = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[12]/td[4]")
-            order.task_description = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[13]/td[4]")
-            order.requested_action = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[15]/td[2]")
-            order.corrective_action = WebAutomation.find_xpath_helper(driver, "/html/body/table/tbody/tr[16]/td[2]")
-
-        return order
+
+        # Work order pages can have one of two different layouts (wait for either)
+        html = WebAutomation.get_result_html(driver, anchors=[ORDER_LAYOUT_1_XPATH, ORDER_LAYOUT_2_XPATH])
+        if html is None:  # No result page loaded
+            return None
+        try:
+            return PageParser.parse_order(html, order_number)
+        except ValueError:  # Not a work order page
+            return None
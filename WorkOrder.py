@@ -1,29 +1,32 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
 class WorkOrder:
-    def __init__(self, order_number: str):
-        """A work order containing all relevant data.
+    """A work order containing all relevant data.
 
-        Args:
-            order_number: Work order number for this work order (ex. 'HM-463785').
-        """
-        self.order_number = order_number
-        self.facility = None
-        self.building = None
-        self.location_id = None
-        self.priority = None
-        self.request_date = None
-        self.schedule_date = None
-        self.work_status = None
-        self.date_closed = None
-        self.main_charge_account = None
-        self.task_code = None
-        self.reference_number = None
-        self.tag_number = None
-        self.item_description = None
-        self.request_time = None
-        self.date_last_posted = None
-        self.trade = None
-        self.contractor_name = None
-        self.est_completion_date = None
-        self.task_description = None
-        self.requested_action = None
-        self.corrective_action = None
+    Attributes:
+        order_number: Work order number for this work order (ex. 'HM-463785').
+    """
+    order_number: str
+    facility: str | None = None
+    building: str | None = None
+    location_id: str | None = None
+    priority: str | None = None
+    request_date: str | None = None
+    schedule_date: str | None = None
+    work_status: str | None = None
+    date_closed: str | None = None
+    main_charge_account: str | None = None
+    task_code: str | None = None
+    reference_number: str | None = None
+    tag_number: str | None = None
+    item_description: str | None = None
+    request_time: str | None = None
+    date_last_posted: str | None = None
+    trade: str | None = None
+    contractor_name: str | None = None
+    est_completion_date: str | None = None
+    task_description: str | None = None
+    requested_action: str | None = None
+    corrective_action: str | None = None
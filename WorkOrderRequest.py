@@ -1,23 +1,26 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
 class WorkOrderRequest:
-    def __init__(self, request_id: int):
-        """A work order request containing all data pertaining to the request.
+    """A work order request containing all data pertaining to the request.
 
-        Args:
-            request_id: id of this work order request (ex. 379422)
-        """
-        self.id = request_id
-        self.room = None
-        self.status = None
-        self.building = None
-        self.tag = None
-        self.accept_date = None
-        self.reject_date = None
-        self.reject_reason = None
-        self.location = None
-        self.item_description = None
-        self.work_order_num = None
-        self.area_description = None
-        self.requested_action = None
+    Attributes:
+        id: id of this work order request (ex. 379422)
+    """
+    id: int
+    room: str | None = None
+    status: str | None = None
+    building: str | None = None
+    tag: str | None = None
+    accept_date: str | None = None
+    reject_date: str | None = None
+    reject_reason: str | None = None
+    location: str | None = None
+    item_description: str | None = None
+    work_order_num: str | None = None
+    area_description: str | None = None
+    requested_action: str | None = None
 
     def to_list(self) -> list:
         """Convert this request into an ordered list of all datapoints.